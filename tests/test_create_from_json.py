@@ -0,0 +1,164 @@
+import json
+
+import pytest
+from tree_mark.scripts.create_from_json import recreate_from_json
+
+
+def _listing(root):
+    return sorted(str(p.relative_to(root)) + ("/" if p.is_dir() else "") for p in root.rglob("*"))
+
+
+@pytest.mark.asyncio
+async def test_recreate_from_flat_list(tmp_path):
+    src = tmp_path / "tree.json"
+    src.write_text(json.dumps({"tree": {}, "flat": ["proj/a/b/x.py", "proj/a/b/y.py", "proj/a/z.md", "proj/top.txt"]}))
+    dest = tmp_path / "out" / "nested"
+
+    await recreate_from_json(str(src), str(dest))
+    assert _listing(dest) == [
+        "proj/", "proj/a/", "proj/a/b/", "proj/a/b/x.py", "proj/a/b/y.py", "proj/a/z.md", "proj/top.txt",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_recreate_dry_run_creates_nothing(tmp_path):
+    src = tmp_path / "tree.json"
+    src.write_text(json.dumps(["proj/a/x.py"]))
+
+    await recreate_from_json(str(src), str(tmp_path / "out"), dry_run=True)
+    assert not (tmp_path / "out").exists()
+
+
+@pytest.mark.asyncio
+async def test_recreate_from_nested_tree(tmp_path):
+    src = tmp_path / "tree.json"
+    tree = {"name": "proj", "type": "directory", "children": [
+        {"name": "a", "type": "directory", "children": [{"name": "x.py", "type": "file"}]},
+        {"name": "empty", "type": "directory"},
+        {"name": "top.txt", "type": "file"},
+    ]}
+    src.write_text(json.dumps({"tree": tree}))
+
+    await recreate_from_json(str(src), str(tmp_path / "out"))
+    assert _listing(tmp_path / "out") == ["proj/", "proj/a/", "proj/a/x.py", "proj/empty/", "proj/top.txt"]
+
+
+@pytest.mark.asyncio
+async def test_create_from_tree_deeper_than_recursion_limit(tmp_path):
+    import sys
+    from tree_mark.scripts.create_from_json import _create_from_tree
+
+    root = node = {"name": "d", "type": "directory"}
+    for _ in range(sys.getrecursionlimit() + 100):
+        child = {"name": "d", "type": "directory"}
+        node["children"] = [child]
+        node = child
+    await _create_from_tree(root, str(tmp_path / "out"), dry_run=True)
+
+
+@pytest.mark.asyncio
+async def test_recreate_reparses_json_only_when_file_changes(tmp_path):
+    from tree_mark.scripts.create_from_json import _load_json_cached
+
+    src = tmp_path / "tree.json"
+    src.write_text(json.dumps(["proj/x.py"]))
+    await recreate_from_json(str(src), str(tmp_path / "out"), dry_run=True)
+    hits = _load_json_cached.cache_info().hits
+    await recreate_from_json(str(src), str(tmp_path / "out"))
+    assert _load_json_cached.cache_info().hits == hits + 1
+
+    src.write_text(json.dumps(["proj/x.py", "proj/y.py"]))
+    await recreate_from_json(str(src), str(tmp_path / "out"))
+    assert _listing(tmp_path / "out") == ["proj/", "proj/x.py", "proj/y.py"]
+
+
+@pytest.mark.asyncio
+async def test_recreate_many_directories(tmp_path):
+    src = tmp_path / "tree.json"
+    flat = [f"proj/d{i}/e{k}/f.py" for i in range(20) for k in range(5)]
+    src.write_text(json.dumps(flat))
+
+    await recreate_from_json(str(src), str(tmp_path / "out"))
+    assert sorted(p for p in _listing(tmp_path / "out") if p.endswith(".py")) == sorted(flat)
+
+
+@pytest.mark.asyncio
+async def test_recreate_rejects_unsupported_json(tmp_path):
+    from tree_mark.exceptions import RepositoryError
+
+    src = tmp_path / "scalar.json"
+    src.write_text("42")
+    with pytest.raises(RepositoryError):
+        await recreate_from_json(str(src), str(tmp_path / "out"))
+
+
+@pytest.mark.asyncio
+async def test_recreate_keeps_existing_files_unless_asked(tmp_path):
+    src = tmp_path / "tree.json"
+    src.write_text(json.dumps(["proj/a/kept.py", "proj/a/new.py"]))
+    kept = tmp_path / "out" / "proj" / "a" / "kept.py"
+    kept.parent.mkdir(parents=True)
+    kept.write_text("content")
+
+    await recreate_from_json(str(src), str(tmp_path / "out"))
+    assert kept.read_text() == "content"
+    assert (kept.parent / "new.py").exists()
+
+    await recreate_from_json(str(src), str(tmp_path / "out"), skip_existing=False)
+    assert kept.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_recreate_wraps_listing_errors(tmp_path, monkeypatch):
+    import os
+    from tree_mark.exceptions import RepositoryError
+
+    src = tmp_path / "tree.json"
+    src.write_text(json.dumps(["proj/a.py"]))
+    (tmp_path / "out").mkdir()
+
+    def denied(path):
+        raise PermissionError(13, "Permission denied", path)
+
+    monkeypatch.setattr(os, "scandir", denied)
+    with pytest.raises(RepositoryError):
+        await recreate_from_json(str(src), str(tmp_path / "out"))
+    # a dry run doesn't probe the destination
+    await recreate_from_json(str(src), str(tmp_path / "out"), dry_run=True)
+
+
+@pytest.mark.asyncio
+async def test_legacy_dry_run_reports_existing_files(tmp_path):
+    from loguru import logger
+
+    src = tmp_path / "legacy.json"
+    src.write_text(json.dumps({"path": "proj", "type": "directory", "children": [{"path": "proj/kept.py", "type": "file"}]}))
+    kept = tmp_path / "out" / "proj" / "kept.py"
+    kept.parent.mkdir(parents=True)
+    kept.write_text("content")
+
+    messages = []
+    sink = logger.add(lambda m: messages.append(m.record["message"]), level="INFO")
+    try:
+        await recreate_from_json(str(src), str(tmp_path / "out"), dry_run=True)
+    finally:
+        logger.remove(sink)
+    assert f"Would create file: {kept}" in messages
+
+    await recreate_from_json(str(src), str(tmp_path / "out"))
+    assert kept.read_text() == "content"
+
+
+@pytest.mark.asyncio
+async def test_recreate_normalises_paths_and_accepts_an_empty_dest(tmp_path, monkeypatch):
+    src = tmp_path / "tree.json"
+    src.write_text(json.dumps(["proj//a/kept.py", "./proj/b.py"]))
+    out = tmp_path / "out"
+    kept = out / "proj" / "a" / "kept.py"
+    kept.parent.mkdir(parents=True)
+    kept.write_text("content")
+
+    monkeypatch.chdir(out)
+    await recreate_from_json(str(src), "")
+    assert kept.read_text() == "content"
+    assert _listing(out) == ["proj/", "proj/a/", "proj/a/kept.py", "proj/b.py"]
@@ -1,6 +1,8 @@
 # === FILE: tests/test_scanner.py ===
 
 import asyncio
+import os
+import time
 import pytest
 from tree_mark.adapters.filesystem.scanner import LocalFileSystemScanner
 
@@ -15,6 +17,22 @@ async def test_scan_current_dir(tmp_path):
     assert node is not None
 
 
+@pytest.mark.asyncio
+async def test_scan_builds_nested_tree_with_sizes(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / "f.txt").write_text("hello")
+    (tmp_path / "g.py").write_text("x")
+
+    scanner = LocalFileSystemScanner(max_concurrency=2)
+    node = await scanner.scan(str(tmp_path), include_extensions=[".txt"])
+    assert node.is_dir
+    children = {c.name: c for c in node.children}
+    assert set(children) == {"sub"}
+    assert children["sub"].is_dir
+    assert [(c.name, c.size) for c in children["sub"].children] == [("f.txt", 5)]
+
+
 # def test_scan_current_dir(tmp_path):
 #     async def _inner():
 #         p = tmp_path / "a"
@@ -26,3 +44,123 @@ async def test_scan_current_dir(tmp_path):
 #         assert node is not None
 #
 #     asyncio.run(_inner())
+
+
+@pytest.mark.asyncio
+async def test_scan_extension_filters_are_case_insensitive(tmp_path):
+    (tmp_path / "A.TXT").write_text("a")
+    (tmp_path / "b.txt").write_text("b")
+    (tmp_path / "c.log").write_text("c")
+
+    scanner = LocalFileSystemScanner(max_concurrency=2)
+    node = await scanner.scan(str(tmp_path), include_extensions=[".txt"])
+    assert sorted(c.name for c in node.children) == ["A.TXT", "b.txt"]
+
+    node = await scanner.scan(str(tmp_path), exclude_extensions=["TXT"])
+    assert [c.name for c in node.children] == ["c.log"]
+
+
+@pytest.mark.asyncio
+async def test_scan_without_sizes(tmp_path):
+    (tmp_path / "f.txt").write_text("hello")
+
+    scanner = LocalFileSystemScanner(max_concurrency=2, collect_sizes=False)
+    node = await scanner.scan(str(tmp_path))
+    assert [(c.name, c.size) for c in node.children] == [("f.txt", None)]
+
+    from tree_mark.core.entities.flat_tree import FlatTree
+    flat = FlatTree.from_treenode(node)
+    assert len(flat.sizes) == 0 and flat.size(1) is None
+    assert flat.to_treenode() == node
+
+
+@pytest.mark.asyncio
+async def test_flat_tree_round_trips_scanned_tree(tmp_path):
+    from tree_mark.core.entities.flat_tree import FlatTree
+
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "x.py").write_text("x")
+    (tmp_path / "a" / "y.txt").write_text("yy")
+    (tmp_path / "z.md").write_text("")
+
+    node = await LocalFileSystemScanner(max_concurrency=2).scan(str(tmp_path))
+    flat = FlatTree.from_treenode(node)
+    assert len(flat) == 6
+    assert flat.to_treenode() == node
+
+
+@pytest.mark.asyncio
+async def test_generate_reuses_scan_until_tree_changes(tmp_path, monkeypatch):
+    from tree_mark.core.usecases.generate_structure import GenerateStructureUseCase
+    from tree_mark.core.models.schemas import OutputFormat
+
+    src = tmp_path / "src"
+    (src / "pkg").mkdir(parents=True)
+    (src / "pkg" / "a.py").write_text("a")
+    # directories modified just before a scan started are never cached, so age them
+    old = time.time() - 60
+    for d in (src, src / "pkg"):
+        os.utime(d, (old, old))
+
+    scans = []
+    original_scan = LocalFileSystemScanner.scan
+
+    async def counting_scan(self, *args, **kwargs):
+        scans.append(args[0])
+        return await original_scan(self, *args, **kwargs)
+
+    monkeypatch.setattr(LocalFileSystemScanner, "scan", counting_scan)
+    usecase = GenerateStructureUseCase(max_concurrency=2)
+    out = str(tmp_path / "out")
+
+    await usecase.generate(str(src), output=OutputFormat.MARKDOWN, outputs_dir=out)
+    await usecase.generate(str(src), output=OutputFormat.MARKDOWN, outputs_dir=out)
+    assert len(scans) == 1
+
+    # a change below the root invalidates the cached scan
+    (src / "pkg" / "b.py").write_text("b")
+    res = await usecase.generate(str(src), output=OutputFormat.MARKDOWN, outputs_dir=out)
+    assert len(scans) == 2
+    with open(res.results["markdown"], encoding="utf-8") as fh:
+        assert "b.py" in fh.read()
+
+    # pkg was modified moments before that scan started, so it may have missed a change: not cached
+    await usecase.generate(str(src), output=OutputFormat.MARKDOWN, outputs_dir=out)
+    assert len(scans) == 3
+
+
+@pytest.mark.asyncio
+async def test_extension_filter_handles_dotfiles_and_multi_dot_suffixes(tmp_path):
+    for name in (".py", "a.py", "b.tar.gz", ".hidden.PY", ".tar.gz"):
+        (tmp_path / name).write_text("x")
+
+    scanner = LocalFileSystemScanner(max_concurrency=2)
+    node = await scanner.scan(str(tmp_path), include_extensions=["py"])
+    # '.py' is a dotfile without an extension
+    assert sorted(c.name for c in node.children) == [".hidden.PY", "a.py"]
+
+    node = await scanner.scan(str(tmp_path), include_extensions=[".tar.gz"])
+    assert [c.name for c in node.children] == ["b.tar.gz"]
+    node = await scanner.scan(str(tmp_path), exclude_extensions=[".gz", ".py"])
+    assert sorted(c.name for c in node.children) == [".py"]
+    node = await scanner.scan(str(tmp_path), exclude_extensions=["tar.gz"])
+    assert sorted(c.name for c in node.children) == [".hidden.PY", ".py", ".tar.gz", "a.py"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not hasattr(os, "symlink") or os.name == "nt", reason="needs symlinks")
+async def test_extension_filters_apply_to_symlinks(tmp_path):
+    (tmp_path / "real").mkdir()
+    (tmp_path / "notes.txt").write_text("x")
+    (tmp_path / "main.py").write_text("x")
+    os.symlink(tmp_path / "notes.txt", tmp_path / "link.txt")
+    os.symlink(tmp_path / "missing.log", tmp_path / "dangling.log")
+    os.symlink(tmp_path / "real", tmp_path / "dirlink", target_is_directory=True)
+
+    scanner = LocalFileSystemScanner(max_concurrency=2)
+    node = await scanner.scan(str(tmp_path), include_extensions=[".py"])
+    # symlinks are never followed: dirlink is a leaf and, like the file links, subject to the filter
+    assert sorted(c.name for c in node.children) == ["main.py", "real"]
+
+    node = await scanner.scan(str(tmp_path), exclude_extensions=[".txt", ".log"])
+    assert sorted(c.name for c in node.children) == ["dirlink", "main.py", "real"]
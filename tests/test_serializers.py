@@ -0,0 +1,143 @@
+import json
+
+import pytest
+from tree_mark.core.entities.tree_node import TreeNode
+from tree_mark.adapters.repository.file_repository import dumps_json_bytes
+from tree_mark.adapters.serializers.json_serializer import iter_json_bytes, serialize_to_json
+from tree_mark.adapters.serializers.markdown_serializer import parse_markdown_to_tree, serialize_to_markdown
+
+
+def _sample_tree() -> TreeNode:
+    root = TreeNode(name="root", path="root", is_dir=True)
+    sub = TreeNode(name="sub", path="root/sub", is_dir=True)
+    sub.add_child(TreeNode(name="b.txt", path="root/sub/b.txt", is_dir=False))
+    root.add_child(sub)
+    root.add_child(TreeNode(name="a.py", path="root/a.py", is_dir=False))
+    return root
+
+
+@pytest.mark.asyncio
+async def test_markdown_round_trip():
+    md = await serialize_to_markdown(_sample_tree())
+    assert md == "- root/\n  - sub/\n    - b.txt\n  - a.py"
+    assert await serialize_to_markdown(_sample_tree(), keep_extensions=False) == "- root/\n  - sub/\n    - b\n  - a"
+
+    parsed = parse_markdown_to_tree(md)
+    assert await serialize_to_markdown(parsed) == md
+    assert parsed.children[0].children[0].path == "root/sub/b.txt"
+
+
+def test_parse_markdown_keeps_leading_dashes_in_names():
+    root = parse_markdown_to_tree("- root/\n  - --foo\n  - d/\n    - x.py")
+    assert [(c.name, c.is_dir) for c in root.children] == [("--foo", False), ("d", True)]
+    assert [c.name for c in root.children[1].children] == ["x.py"]
+
+
+@pytest.mark.asyncio
+async def test_serialize_to_json_tree_and_flat():
+    data = await serialize_to_json(_sample_tree(), keep_extensions=False)
+    assert data["flat"] == ["root/sub/b.txt", "root/a.py"]
+    assert data["tree"] == {
+        "name": "root",
+        "type": "directory",
+        "children": [
+            {"name": "sub", "type": "directory", "children": [{"name": "b", "type": "file"}]},
+            {"name": "a", "type": "file"},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_iter_json_bytes_matches_write_json_file():
+    tree = _sample_tree()
+    for keep_extensions in (True, False):
+        expected = dumps_json_bytes(await serialize_to_json(tree, keep_extensions=keep_extensions))
+        assert b"".join(iter_json_bytes(tree, keep_extensions=keep_extensions, chunk_nodes=2)) == expected
+
+    # a root named "" (e.g. from a deserialized document) contributes no leading '/' to the flat paths
+    root = TreeNode(name="", path="", is_dir=True)
+    sub = TreeNode(name="d", path="d", is_dir=True)
+    sub.add_child(TreeNode(name="y.py", path="d/y.py", is_dir=False))
+    root.add_child(TreeNode(name="x.py", path="x.py", is_dir=False))
+    root.add_child(sub)
+    expected = dumps_json_bytes(await serialize_to_json(root))
+    assert json.loads(expected)["flat"] == ["x.py", "d/y.py"]
+    assert b"".join(iter_json_bytes(root, chunk_nodes=1)) == expected
+
+
+def test_parse_markdown_returns_a_fresh_tree_per_call():
+    md = "- root/\n  - a.py"
+    first = parse_markdown_to_tree(md)
+    first.children.clear()
+    second = parse_markdown_to_tree(md)
+    assert second is not first
+    assert [c.name for c in second.children] == ["a.py"]
+
+
+@pytest.mark.asyncio
+async def test_serialize_to_json_tree_matches_export_schema():
+    from tree_mark.core.models.schemas import ExportNodeSchema
+
+    data = await serialize_to_json(_sample_tree())
+    schema = ExportNodeSchema.model_validate(data["tree"])
+    assert schema.model_dump(mode="json", exclude_none=True) == data["tree"]
+
+
+@pytest.mark.asyncio
+async def test_serializers_handle_trees_deeper_than_recursion_limit():
+    import sys
+
+    from tree_mark.adapters.serializers.json_serializer import dict_tree_to_treenode, node_to_tree_dict
+
+    depth = sys.getrecursionlimit() + 100
+    root = node = TreeNode(name="d0", path="d0", is_dir=True)
+    for i in range(1, depth):
+        child = TreeNode(name=f"d{i}", path=f"{node.path}/d{i}", is_dir=True)
+        node.add_child(child)
+        node = child
+    node.add_child(TreeNode(name="leaf.txt", path=f"{node.path}/leaf.txt", is_dir=False))
+
+    data = await serialize_to_json(root)
+    assert data["flat"] == [node.path + "/leaf.txt"]
+    assert dict_tree_to_treenode(node_to_tree_dict(root)) is not None
+    md = await serialize_to_markdown(root)
+    assert await serialize_to_markdown(parse_markdown_to_tree(md)) == md
+
+
+@pytest.mark.asyncio
+async def test_read_json_flat_sample_without_loading_tree(tmp_path):
+    import json
+
+    from tree_mark.adapters.repository.file_repository import read_json_flat_sample
+
+    written = tmp_path / "out.json"
+    written.write_bytes(b"".join(iter_json_bytes(_sample_tree())))
+    assert await read_json_flat_sample(str(written), 1) == ["root/sub/b.txt"]
+    assert await read_json_flat_sample(str(written), 5) == ["root/sub/b.txt", "root/a.py"]
+
+    # other layouts fall back to a full load
+    compact = tmp_path / "compact.json"
+    compact.write_text(json.dumps({"tree": {}, "flat": ["x", "y"]}))
+    assert await read_json_flat_sample(str(compact), 1) == ["x"]
+
+    empty = tmp_path / "empty.json"
+    empty.write_bytes(b"".join(iter_json_bytes(TreeNode(name="d", path="d", is_dir=True))))
+    assert await read_json_flat_sample(str(empty)) == []
+
+
+def test_load_json_flat_list_only_for_treemark_layout(tmp_path):
+    import json
+
+    from tree_mark.adapters.repository.file_repository import load_json_flat_list
+
+    written = tmp_path / "out.json"
+    written.write_bytes(b"".join(iter_json_bytes(_sample_tree())))
+    assert load_json_flat_list(str(written)) == ["root/sub/b.txt", "root/a.py"]
+
+    # "flat" not last, or not indented as written by TreeMark
+    trailing = tmp_path / "trailing.json"
+    trailing.write_text(json.dumps({"flat": ["x"], "tree": {"children": []}}, indent=2))
+    assert load_json_flat_list(str(trailing)) is None
+    compact = tmp_path / "compact.json"
+    compact.write_text(json.dumps({"tree": {}, "flat": ["x"]}))
+    assert load_json_flat_list(str(compact)) is None
@@ -9,6 +9,9 @@ from tree_mark.core.entities.tree_node import TreeNode
 from tree_mark.exceptions import ScannerError
 from loguru import logger
 
+# read buffer used while parsing the central directory of an archive
+_ZIP_READ_BUFFER = 1024 * 1024
+
 class ZipArchiveScanner(ScannerInterface):
     """Scans contents of a zip archive and builds a TreeNode representation.
 
@@ -23,24 +26,46 @@ class ZipArchiveScanner(ScannerInterface):
 
     def _scan_sync(self, path: str, include_extensions: Optional[List[str]], exclude_extensions: Optional[List[str]]) -> TreeNode:
         path = os.fspath(path)
-        if not zipfile.is_zipfile(path):
-            raise FileNotFoundError(f"Not a zip archive: {path}")
         name = os.path.basename(path)
         root = TreeNode(name=name, path=path, is_dir=True)
 
-        with zipfile.ZipFile(path, 'r') as zf:
-            # Build a directory tree from zip namelist
-            nodes = {"": root}
-            for info in zf.infolist():
-                parts = info.filename.rstrip('/').split('/')
-                # skip top-level empty
-                curr_path = ''
-                for i, part in enumerate(parts):
-                    parent_key = curr_path
-                    curr_path = f"{curr_path}/{part}" if curr_path else part
-                    if curr_path not in nodes:
-                        is_dir = (i < len(parts)-1) or info.is_dir()
-                        node = TreeNode(name=part, path=curr_path, is_dir=is_dir, size=(info.file_size if not is_dir else None))
-                        nodes[curr_path] = node
-                        nodes[parent_key].add_child(node)
-            return root
\ No newline at end of file
+        # Open the archive once: ZipFile validates the end-of-central-directory record itself, so a
+        # separate is_zipfile() pass would only repeat the same open/seek/parse. The large buffer keeps
+        # the EOCD / central-directory reads to few syscalls on big archives.
+        try:
+            fh = open(path, 'rb', buffering=_ZIP_READ_BUFFER)
+        except OSError as exc:
+            raise FileNotFoundError(f"Not a zip archive: {path}") from exc
+
+        with fh:
+            try:
+                zf = zipfile.ZipFile(fh, 'r')
+            except zipfile.BadZipFile as exc:
+                raise FileNotFoundError(f"Not a zip archive: {path}") from exc
+
+            with zf:
+                # Sort entries by path components so that entries sharing a prefix are adjacent; each
+                # entry then only creates nodes for the components after its longest common prefix with
+                # the previous entry, using a stack of the currently open directories.
+                entries = sorted(
+                    ((info.filename.rstrip('/').split('/'), info) for info in zf.infolist()),
+                    key=lambda e: e[0],
+                )
+                prev_parts: List[str] = []
+                dir_stack: List[TreeNode] = [root]
+                for parts, info in entries:
+                    lcp = 0
+                    limit = min(len(parts), len(prev_parts))
+                    while lcp < limit and parts[lcp] == prev_parts[lcp]:
+                        lcp += 1
+                    del dir_stack[lcp + 1:]
+                    last = len(parts) - 1
+                    for i in range(lcp, len(parts)):
+                        part = parts[i]
+                        parent = dir_stack[-1]
+                        is_dir = (i < last) or info.is_dir()
+                        node = TreeNode(name=part, path=f"{parent.path}/{part}" if i else part, is_dir=is_dir, size=(info.file_size if not is_dir else None))
+                        parent.add_child(node)
+                        dir_stack.append(node)
+                    prev_parts = parts
+                return root
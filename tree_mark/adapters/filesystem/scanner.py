@@ -1,68 +1,165 @@
-# === FILE: tree_mark/adapters/filesystem/scanner.py ===
 import os
+import stat
+import sys
 import asyncio
-from typing import Optional, List
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional, List, Tuple
 from tree_mark.core.interfaces.scanner_interface import ScannerInterface
 from tree_mark.core.entities.tree_node import TreeNode
 from tree_mark.exceptions import ScannerError
 from loguru import logger
 
+def _extension_suffixes(extensions: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+    """Normalise user supplied extensions ('.py', 'PY', ...) to a tuple of lowercase '.ext' suffixes.
+
+    None means no filter. Multi-dot suffixes ('.tar.gz') are kept and match names ending in them, so a
+    single str.endswith call on the lowercased name decides membership (see _scan_dir).
+    """
+    if not extensions:
+        return None
+    normalised = {e if e.startswith('.') else f".{e}" for e in (e.strip().lower() for e in extensions) if e}
+    if not normalised:
+        return None
+    return tuple(sorted(normalised))
+
+
+def _dotfile_matches(lname: str, suffixes: Tuple[str, ...]) -> bool:
+    """Whether a lowercased name starting with '.' ends in one of suffixes with something other than
+    dots before it: like os.path.splitext, '.py' is a dotfile without an extension but '.cfg.py' has one."""
+    return any(lname.endswith(s) and lname[:-len(s)].strip('.') for s in suffixes)
+
+
+def _fs_concurrency_limit(max_concurrency: int) -> int:
+    """How many directory listings may be in flight at once.
+
+    TREEMARK_FS_CONCURRENCY overrides the default. On macOS the default is min(cpu_count, 8):
+    APFS serialises concurrent directory opens on a kernel lock, so more in-flight scandir calls
+    only add system time. Elsewhere the limit is max_concurrency.
+    """
+    raw = os.environ.get("TREEMARK_FS_CONCURRENCY")
+    if raw:
+        try:
+            limit = int(raw)
+            if limit > 0:
+                return limit
+        except ValueError:
+            pass
+        logger.warning("Ignoring invalid TREEMARK_FS_CONCURRENCY={!r}", raw)
+    if sys.platform == "darwin":
+        return max(1, min(max_concurrency, os.cpu_count() or 1, 8))
+    return max(1, max_concurrency)
+
+
 class LocalFileSystemScanner(ScannerInterface):
     """Local filesystem scanner with configurable concurrency.
 
-    It builds asynchronous concurrency by launching child scans concurrently using asyncio tasks
-    but constrains the concurrency by a semaphore (max_concurrency) to avoid resource exhaustion.
+    Directories are listed in parallel on a bounded thread pool (at most max_concurrency workers,
+    capped at twice the CPU count) so that readdir latency on slow disks / network filesystems overlaps.
+    A coordinator thread hands every discovered sub-directory to the pool; the asyncio event loop only
+    awaits the coordinator, so the walk never blocks the loop.
+    The scandir calls themselves are additionally bounded by a semaphore (see _fs_concurrency_limit),
+    which keeps the number of concurrent directory opens below the point of kernel lock contention.
+
+    collect_sizes=False leaves TreeNode.size unset for files. Entry types come from the readdir d_type
+    field on Linux/macOS, so without sizes a scan issues no per-file stat syscall at all.
     """
-    def __init__(self, max_concurrency: int = 10):
-        self._semaphore = asyncio.Semaphore(max_concurrency)
+    def __init__(self, max_concurrency: int = 10, collect_sizes: bool = True):
+        self._collect_sizes = collect_sizes
+        self._fs_sem = threading.BoundedSemaphore(_fs_concurrency_limit(max_concurrency))
+        self._max_workers = max(1, min(max_concurrency, 2 * (os.cpu_count() or 1)))
 
     async def scan(self, path: str, include_extensions: Optional[List[str]] = None, exclude_extensions: Optional[List[str]] = None) -> TreeNode:
         try:
-            node = await asyncio.to_thread(self._scan_sync_wrap, path, include_extensions, exclude_extensions)
+            path = os.fspath(path)
+            loop = asyncio.get_running_loop()
+            # the coordinator runs on the default executor: it blocks waiting for the scan pool,
+            # so it must never occupy one of the pool's own workers
+            node = await loop.run_in_executor(None, self._scan_sync, path, include_extensions, exclude_extensions)
             return node
         except Exception as exc:
             logger.exception("Scanner failed for path={}", path)
             raise ScannerError(str(exc)) from exc
 
-    def _scan_sync_wrap(self, path: str, include_extensions: Optional[List[str]], exclude_extensions: Optional[List[str]]) -> TreeNode:
-        # We keep the heavy filesystem traversal synchronous but we can still parallelize child scans at the async layer
-        return self._scan_sync(path, include_extensions, exclude_extensions)
-
     def _scan_sync(self, path: str, include_extensions: Optional[List[str]], exclude_extensions: Optional[List[str]]) -> TreeNode:
-        # synchronous scanning using os.scandir for speed and low memory usage
+        # synchronous scanning using os.scandir for speed and low memory usage.
+        # Only the root is stat'ed explicitly; every other node is built from the DirEntry
+        # returned by its parent's scandir, which reuses the type/stat info cached by readdir.
         path = os.fspath(path)
         name = os.path.basename(path) or path
-        if not os.path.exists(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Path does not exist: {path}")
 
-        is_dir = os.path.isdir(path)
-        size = os.path.getsize(path) if not is_dir else None
-        node = TreeNode(name=name, path=path, is_dir=is_dir, size=size)
-
+        is_dir = stat.S_ISDIR(st.st_mode)
+        node = TreeNode(name=name, path=path, is_dir=is_dir, size=None if is_dir else st.st_size)
         if is_dir:
-            try:
-                with os.scandir(path) as it:
-                    entries = list(it)
-            except PermissionError:
-                logger.warning("Permission denied while scanning: {}", path)
+            # filters are normalised once for the whole walk
+            include = _extension_suffixes(include_extensions)
+            exclude = _extension_suffixes(exclude_extensions)
+            # the root is listed on this thread; the pool is only started if there is anything below it
+            subdirs = self._scan_dir(node, include, exclude)
+            if not subdirs:
                 return node
+            with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="treemark-scan") as pool:
+                pending = {pool.submit(self._scan_dir, child, include, exclude) for child in subdirs}
+                try:
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            for child in future.result():
+                                pending.add(pool.submit(self._scan_dir, child, include, exclude))
+                except BaseException:
+                    for future in pending:
+                        future.cancel()
+                    raise
+        return node
+
+    def _scan_dir(self, node: TreeNode, include: Optional[Tuple[str, ...]], exclude: Optional[Tuple[str, ...]]) -> List[TreeNode]:
+        """List a single directory, attach its entries to node and return the sub-directories still to scan.
 
-            # We'll scan children concurrently at the async outer layer using to_thread per child - so return children placeholders here
-            for entry in entries:
-                if not entry.name:
+        Children are attached in scandir order, so the final tree does not depend on which worker finishes first.
+        """
+        subdirs: List[TreeNode] = []
+        try:
+            # only the listing is bounded; building the child nodes below runs outside the semaphore
+            with self._fs_sem:
+                with os.scandir(node.path) as it:
+                    entries = list(it)
+        except PermissionError:
+            logger.warning("Permission denied while scanning: {}", node.path)
+            return subdirs
+
+        # The loop below runs once per directory entry and dominates large scans, so the names it
+        # uses are bound to locals and nodes are built positionally (name, path, is_dir, size).
+        make_node = TreeNode
+        add_child = node.children.append
+        add_subdir = subdirs.append
+        filtering = include is not None or exclude is not None
+        collect_sizes = self._collect_sizes
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                child = make_node(entry.name, entry.path, True)
+                add_child(child)
+                add_subdir(child)
+                continue
+
+            # extension filters (case-insensitive) apply to every non-directory, symlinks included.
+            # A suffix at the end of the name only fails to count when nothing but dots precede it ('.py'),
+            # so only dotfiles need the slower check.
+            if filtering:
+                lname = entry.name.lower()
+                if include is not None and not (lname.endswith(include) and (lname[0] != '.' or _dotfile_matches(lname, include))):
+                    continue
+                if exclude is not None and lname.endswith(exclude) and (lname[0] != '.' or _dotfile_matches(lname, exclude)):
                     continue
-                # extension filters
-                if include_extensions and entry.is_file():
-                    if not any(entry.name.endswith(ext) for ext in include_extensions):
-                        continue
-                if exclude_extensions and entry.is_file():
-                    if any(entry.name.endswith(ext) for ext in exclude_extensions):
-                        continue
-                # For a synchronous traversal we directly recurse
+            size = None
+            if collect_sizes:
                 try:
-                    child = self._scan_sync(entry.path, include_extensions, exclude_extensions)
-                    node.add_child(child)
-                except PermissionError:
-                    logger.warning("Skipping path due to permission error: {}", entry.path)
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    logger.warning("Skipping path due to stat error: {}", entry.path)
                     continue
-        return node
\ No newline at end of file
+            add_child(make_node(entry.name, entry.path, False, size))
+        return subdirs
@@ -1,26 +1,221 @@
 # === FILE: tree_mark/adapters/repository/file_repository.py ===
 import os
-import aiofiles
-from typing import Any
+import json
+import mmap
+import asyncio
+import threading
+from enum import Enum
+from typing import IO, Any, Iterable, List, Optional, Set
 from loguru import logger
-from tree_mark.exceptions import RepositoryError
+from tree_mark.exceptions import RepositoryError, TreeMarkError
+
+try:  # optional: much faster encoder that emits UTF-8 bytes directly
+    import orjson
+except ImportError:
+    orjson = None
+
+# write buffer for streamed outputs: chunks are flushed to the OS in blocks of this size.
+# Serializer blocks are already tens of KiB, so a 10 MB document is ~150 write calls and both outputs
+# are written concurrently (see GenerateStructureUseCase.generate); 1 MiB buffers or writev batching
+# measured no difference, the time goes into producing the bytes.
+_STREAM_BUFFER = 64 * 1024
+
+# the top-level "flat" key as written by the 2-space indented encoders (nested keys are indented deeper,
+# and encoded strings never contain raw newlines, so this only matches the real key)
+_FLAT_KEY = b'\n  "flat": ['
+# bytes after _FLAT_KEY decoded when sampling the flat list
+_FLAT_SAMPLE_WINDOW = 64 * 1024
+
+# directories already created (or found to exist) by this process, so repeated writes into
+# the same directory skip the makedirs syscalls
+_MKDIR_SEEN: Set[str] = set()
+_MKDIR_LOCK = threading.Lock()
+
+def _ensure_parent_dir(path: str) -> str:
+    parent = os.path.dirname(path) or "."
+    if parent not in _MKDIR_SEEN:
+        os.makedirs(parent, exist_ok=True)
+        with _MKDIR_LOCK:
+            _MKDIR_SEEN.add(parent)
+    return parent
+
+def _open_for_write(path: str, mode: str, **kwargs: Any) -> IO:
+    parent = _ensure_parent_dir(path)
+    try:
+        return open(path, mode, **kwargs)
+    except FileNotFoundError:
+        # the directory was removed after we cached it: forget it and retry once
+        with _MKDIR_LOCK:
+            _MKDIR_SEEN.discard(parent)
+        _ensure_parent_dir(path)
+        return open(path, mode, **kwargs)
+
+def _write_text_sync(path: str, content: str) -> None:
+    with _open_for_write(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def _write_bytes_sync(path: str, data: bytes) -> None:
+    with _open_for_write(path, 'wb') as f:
+        f.write(data)
+
+def _write_chunks_sync(path: str, chunks: Iterable[bytes]) -> None:
+    with _open_for_write(path, 'wb', buffering=_STREAM_BUFFER) as f:
+        for chunk in chunks:
+            f.write(chunk)
 
 async def write_text_file(path: str, content: str, overwrite: bool = True) -> str:
     try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        mode = 'w'
-        async with aiofiles.open(path, mode) as f:
-            await f.write(content)
+        # one thread hop for mkdir + open + write + close, instead of a round trip per operation
+        await asyncio.to_thread(_write_text_sync, path, content)
+        return path
+    except Exception as exc:
+        logger.exception("Failed to write file: {}", path)
+        raise RepositoryError(str(exc)) from exc
+
+async def write_bytes_file(path: str, data: bytes, overwrite: bool = True) -> str:
+    try:
+        await asyncio.to_thread(_write_bytes_sync, path, data)
         return path
     except Exception as exc:
         logger.exception("Failed to write file: {}", path)
         raise RepositoryError(str(exc)) from exc
 
+async def write_chunks_file(path: str, chunks: Iterable[bytes], overwrite: bool = True) -> str:
+    """
+    Stream chunks (typically a serializer's generator) to path on a worker thread.
+    The generator is consumed on that thread too, so producing the chunks never blocks the event loop
+    and the full document is never held in memory.
+    """
+    try:
+        await asyncio.to_thread(_write_chunks_sync, path, chunks)
+        return path
+    except TreeMarkError:
+        # errors raised by the producer (e.g. SerializationError) keep their type
+        raise
+    except Exception as exc:
+        logger.exception("Failed to write file: {}", path)
+        raise RepositoryError(str(exc)) from exc
+
+def _json_default(obj: Any) -> Any:
+    # values neither encoder handles natively (e.g. pathlib.Path) are written as strings
+    if isinstance(obj, os.PathLike):
+        return os.fspath(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json_bytes(data: Any) -> bytes:
+    """Encode data as indented UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2, default=_json_default).encode('utf-8')
+
+def loads_json_bytes(data: bytes) -> Any:
+    """Decode JSON from bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _read_bytes_sync(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+async def read_json_file(path: str) -> Any:
+    """Read and decode a JSON file; the read happens on a worker thread."""
+    data = await asyncio.to_thread(_read_bytes_sync, path)
+    return loads_json_bytes(data)
+
+def _flat_sample_sync(path: str, limit: int) -> Optional[List[str]]:
+    """The first limit "flat" entries, found without parsing the tree section; None if the layout doesn't match."""
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            return None
+        with mm:
+            start = mm.find(_FLAT_KEY)
+            if start < 0:
+                return None
+            start += len(_FLAT_KEY)
+            window = mm[start:start + _FLAT_SAMPLE_WINDOW].decode('utf-8', errors='replace')
+    decoder = json.JSONDecoder()
+    sample: List[str] = []
+    pos, end = 0, len(window)
+    while len(sample) < limit:
+        while pos < end and window[pos] in ' \t\r\n,':
+            pos += 1
+        if pos == end:
+            return None
+        if window[pos] == ']':
+            break
+        try:
+            value, pos = decoder.raw_decode(window, pos)
+        except ValueError:
+            return None
+        if not isinstance(value, str):
+            return None
+        sample.append(value)
+    return sample
+
+def load_json_flat_list(path: str) -> Optional[List[str]]:
+    """
+    The whole "flat" list of a TreeMark JSON file in the layout written by write_json_file / the streaming
+    writer, where it is the last key: only that section is decoded, the (larger) tree before it is skipped.
+    None if the file has any other layout. Blocking; call it on a worker thread.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            return None
+        with mm:
+            start = mm.find(_FLAT_KEY)
+            if start < 0:
+                return None
+            # from the list's '[' to its ']', which must be followed only by the document's closing brace
+            start += len(_FLAT_KEY) - 1
+            end = mm.rfind(b']')
+            if end < start or mm[end + 1:].strip() != b'}':
+                return None
+            payload = mm[start:end + 1]
+    try:
+        flat = loads_json_bytes(payload)
+    except ValueError:
+        return None
+    if not isinstance(flat, list) or not all(isinstance(entry, str) for entry in flat):
+        return None
+    return flat
+
+async def read_json_flat_sample(path: str, limit: int = 3) -> List[str]:
+    """
+    The first limit entries of the "flat" list of a TreeMark JSON file. Files in the layout written by
+    write_json_file / the streaming writer are located with one mmap search instead of being loaded;
+    anything else falls back to reading the whole document.
+    """
+    sample = await asyncio.to_thread(_flat_sample_sync, path, limit)
+    if sample is None:
+        data = await read_json_file(path)
+        flat = data.get('flat') if isinstance(data, dict) else None
+        sample = flat[:limit] if isinstance(flat, list) else []
+    return sample
+
+async def read_text_file(path: str, encoding: str = 'utf-8') -> str:
+    """
+    Read a text file on a worker thread. The bytes are read in one call (sized from fstat) and decoded once;
+    newlines are translated as open(path, 'r') would.
+    """
+    text = (await asyncio.to_thread(_read_bytes_sync, path)).decode(encoding)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
 async def write_json_file(path: str, data: Any, overwrite: bool = True) -> str:
-    import json
     try:
-        text = json.dumps(data, ensure_ascii=False, indent=2)
-        return await write_text_file(path, text, overwrite)
+        # encode straight to bytes: no intermediate str and no second UTF-8 encoding pass
+        payload = dumps_json_bytes(data)
     except Exception as exc:
         logger.exception("Failed to write json file: {}", path)
-        raise RepositoryError(str(exc)) from exc
\ No newline at end of file
+        raise RepositoryError(str(exc)) from exc
+    return await write_bytes_file(path, payload, overwrite)
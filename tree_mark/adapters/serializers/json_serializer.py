@@ -14,55 +14,105 @@ CHANGES (new):
 OLD CODE: kept below as comments (for reference).
 """
 
-from typing import Any, Dict, List
+from collections import deque
+from json.encoder import encode_basestring
+from itertools import chain, islice
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from tree_mark.core.entities.flat_tree import FlatTree
 from tree_mark.core.entities.tree_node import TreeNode
 from tree_mark.exceptions import SerializationError
 from loguru import logger
-import os
 
-from tree_mark.core.models.schemas import ExportNodeSchema
+try:  # optional: C encoder for the streaming writer
+    import orjson
+except ImportError:
+    orjson = None
 
+# nodes per block yielded by iter_json_bytes
+_CHUNK_NODES = 2048
 
-def node_to_tree_dict(node: TreeNode, keep_extensions: bool = True) -> Dict[str, Any]:
+
+def _serialize_both(
+    node: Union[TreeNode, FlatTree],
+    keep_extensions: bool = True,
+    prefix: str = "",
+    with_tree: bool = True,
+    with_flat: bool = True,
+) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Single pass producing both the nested tree dict and the flat list of file paths.
+    The tree is consumed as a FlatTree (pre-order arrays), so this is one loop over the arrays;
+    the children list and path of the open node at each depth are kept on two small stacks.
+    Either half can be switched off.
+    """
+    tree = node if isinstance(node, FlatTree) else FlatTree.from_treenode(node)
+    depths = tree.depths
+    labels = tree.display_names(keep_extensions) if with_tree else tree.names
+
+    flat: List[str] = []
+    add_flat = flat.append
+    root: Optional[Dict[str, Any]] = None
+    # children list / path of the open node at each depth; only nodes that have children are pushed
+    kids_stack: List[List[Dict[str, Any]]] = []
+    path_stack: List[str] = []
+    with_kids: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = []
+    d: Optional[Dict[str, Any]] = None
+    # a node has children exactly when the next node in pre-order is deeper
+    next_depths = chain(islice(depths, 1, None), (0,))
+    for name, label, depth, directory, next_depth in zip(tree.names, labels, depths, tree.is_dir, next_depths):
+        # as the recursive flatten_tree_to_paths did: an empty parent path (a node named "") adds no '/'
+        parent_path = path_stack[depth - 1] if depth else prefix
+        current_path = parent_path + "/" + name if parent_path else name
+
+        if with_tree:
+            d = {"name": label, "type": "directory" if directory else "file"}
+            if depth:
+                kids_stack[depth - 1].append(d)
+            else:
+                root = d
+
+        if next_depth > depth:
+            del path_stack[depth:]
+            path_stack.append(current_path)
+            if with_tree:
+                kids: List[Dict[str, Any]] = []
+                del kids_stack[depth:]
+                kids_stack.append(kids)
+                with_kids.append((d, kids))
+        if with_flat and not directory:
+            add_flat(current_path)
+
+    # 'children' goes last and only on nodes that have any, as in the nested format
+    for d, kids in with_kids:
+        d["children"] = kids
+    return root, flat
+
+
+def node_to_tree_dict(node: Union[TreeNode, FlatTree], keep_extensions: bool = True) -> Dict[str, Any]:
     """
     Convert TreeNode -> nested dict with fields { name, type, children }.
     Intentionally **does not** include 'path' or 'size'.
     """
     try:
-        display_name = node.name
-        if not keep_extensions and not node.is_dir:
-            display_name = os.path.splitext(node.name)[0]
-
-        d = {
-            "name": display_name,
-            "type": "directory" if node.is_dir else "file",
-        }
-        if node.children:
-            d["children"] = [node_to_tree_dict(c, keep_extensions=keep_extensions) for c in node.children]
-        return d
+        tree_dict, _ = _serialize_both(node, keep_extensions=keep_extensions, with_flat=False)
+        return tree_dict
     except Exception as exc:
         logger.exception("Failed to convert TreeNode to nested tree dict")
         raise SerializationError(str(exc)) from exc
 
 
-def flatten_tree_to_paths(node: TreeNode, prefix: str = "") -> List[str]:
+def flatten_tree_to_paths(node: Union[TreeNode, FlatTree], prefix: str = "") -> List[str]:
     """
     Return a flat list of file paths (strings) relative to top-level node.
     Directories are not included in the flat list; only files.
     Example output:
       ["app/agentic_sql_assistant.py", "app/application/services/charting_service.py", ...]
     """
-    paths: List[str] = []
-    current = node.name if prefix == "" else f"{prefix}/{node.name}"
-    if node.is_dir:
-        for child in node.children:
-            paths.extend(flatten_tree_to_paths(child, prefix=current))
-    else:
-        paths.append(current)
+    _, paths = _serialize_both(node, prefix=prefix, with_tree=False)
     return paths
 
 
-async def serialize_to_json(node: TreeNode, keep_extensions: bool = True) -> Dict[str, Any]:
+async def serialize_to_json(node: Union[TreeNode, FlatTree], keep_extensions: bool = True) -> Dict[str, Any]:
     """
     Produce the combined JSON object containing a nested tree (no path/size)
     and a flat list of file paths.
@@ -74,43 +124,224 @@ async def serialize_to_json(node: TreeNode, keep_extensions: bool = True) -> Dic
       }
     """
     try:
-        tree_dict = node_to_tree_dict(node, keep_extensions=keep_extensions)
-        flat_list = flatten_tree_to_paths(node, prefix="")  # will include top-level node name
-        # Validate root node with pydantic NodeSchema using the 'tree' structure
-        try:
-            # ExportNodeSchema expects keys name/type/children
-            # schema = parse_obj_as(ExportNodeSchema, tree_dict) # 'parse_obj_as' deprecated.
-            schema = ExportNodeSchema.model_validate(tree_dict)
-            # Validation passed; proceed.
-        except Exception as exc:
-            # If validation fails, log at debug level (not WARNING) because we can still proceed.
-            logger.debug("Export tree did not validate against ExportNodeSchema: {}", exc)
-
+        # one walk builds both sections; the flat list includes the top-level node name.
+        # The dicts match ExportNodeSchema by construction, so they are not re-validated with pydantic
+        # (that cost ~4x the serialization itself and its result was never used).
+        tree_dict, flat_list = _serialize_both(node, keep_extensions=keep_extensions)
         return {"tree": tree_dict, "flat": flat_list}
     except Exception as exc:
         logger.exception("JSON serialization failed")
         raise SerializationError(str(exc)) from exc
 
 
+def _quote(value: str) -> bytes:
+    """value as a JSON string literal, escaped exactly as write_json_file escapes it."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return encode_basestring(value).encode('utf-8')
+
+
+def _array_items(items: List[Any], pad: bytes) -> bytes:
+    """
+    The elements of a non-empty 2-space indented JSON array, each line shifted right by pad, without the brackets.
+    Encoded strings never contain raw newlines, so every b'\n' in the encoder output is layout.
+    """
+    if orjson is None:
+        # only ever given strings on this path (_encode_subtrees formats nodes itself)
+        pad += b'  '
+        return pad + (b',\n' + pad).join([encode_basestring(item).encode('utf-8') for item in items])
+    return pad + orjson.dumps(items, option=orjson.OPT_INDENT_2)[2:-2].replace(b'\n', b'\n' + pad)
+
+
+def _encode_subtrees(tree: FlatTree, labels: List[str], start: int, end: int) -> bytes:
+    """
+    The consecutive sibling subtrees stored in tree[start:end], rendered as they appear in the indented
+    document: one object per subtree, separated by ',\n', braces at column 2 + 4 * depth.
+    labels are the printed names (FlatTree.display_names).
+    """
+    depths = tree.depths[start:end]
+    base = depths[0]
+    next_depths = chain(islice(depths, 1, None), (base,))
+    rows = zip(labels[start:end], depths, tree.is_dir[start:end], next_depths)
+
+    if orjson is not None:
+        # build the nested dicts and let orjson encode the whole group in one call
+        roots: List[Dict[str, Any]] = []
+        kids_stack: List[List[Dict[str, Any]]] = [roots]
+        for name, depth, directory, next_depth in rows:
+            d = {"name": name, "type": "directory" if directory else "file"}
+            level = depth - base
+            kids_stack[level].append(d)
+            if next_depth > depth:
+                kids: List[Dict[str, Any]] = []
+                d["children"] = kids
+                del kids_stack[level + 1:]
+                kids_stack.append(kids)
+        return _array_items(roots, b' ' * (4 * base))
+
+    # json.dumps(indent=...) falls back to the pure-Python encoder, so write the layout directly
+    braces = [' ' * (2 + 4 * depth) for depth in range(base + 1)]
+    members = [' ' * (4 + 4 * depth) for depth in range(base + 1)]
+    out: List[str] = []
+    add = out.append
+    prev_depth = base - 1
+    for name, depth, directory, next_depth in rows:
+        if depth >= len(braces):
+            braces.append(' ' * (2 + 4 * depth))
+            members.append(' ' * (4 + 4 * depth))
+        brace, member = braces[depth], members[depth]
+        # siblings after the first are separated by a comma
+        add(',\n' + brace + '{\n' if prev_depth >= depth else brace + '{\n')
+        add(member + '"name": ' + encode_basestring(name) + ',\n' + member + ('"type": "directory"' if directory else '"type": "file"'))
+        if next_depth > depth:
+            add(',\n' + member + '"children": [\n')
+        else:
+            add('\n' + brace + '}')
+            # close the children lists / objects of the ancestors that end here
+            for level in range(depth - 1, next_depth - 1, -1):
+                add('\n' + members[level] + ']\n' + braces[level] + '}')
+        prev_depth = depth
+    return ''.join(out).encode('utf-8')
+
+
+def iter_json_bytes(node: Union[TreeNode, FlatTree], keep_extensions: bool = True, chunk_nodes: int = _CHUNK_NODES) -> Iterator[bytes]:
+    """
+    Stream the combined {"tree": ..., "flat": [...]} document as UTF-8 bytes, in blocks of about
+    chunk_nodes nodes. The output is byte-identical to write_json_file(serialize_to_json(node)),
+    i.e. indented by 2 spaces, but the whole document is never materialised.
+
+    Runs of whole subtrees of up to chunk_nodes nodes (and blocks of flat paths) are encoded together by
+    _encode_subtrees / _array_items; only the few nodes with larger subtrees are opened and closed here.
+    With orjson installed the per-node encoding therefore runs in C, and memory is bounded by the block size.
+    """
+    try:
+        tree = node if isinstance(node, FlatTree) else FlatTree.from_treenode(node)
+        names, depths, is_dir = tree.names, tree.depths, tree.is_dir
+        labels = tree.display_names(keep_extensions)
+
+        out: List[bytes] = [b'{\n  "tree": ']
+        if len(tree) <= chunk_nodes:
+            # the root's brace follows '"tree": ' on the same line
+            out.append(_encode_subtrees(tree, labels, 0, len(tree))[2:])
+        else:
+            ends = tree.ends
+            # object at tree depth k: braces indented 2 + 4k, members (and its children list) 4 + 4k
+            def open_node(index: int) -> bytes:
+                member = b' ' * (4 + 4 * depths[index])
+                directory = is_dir[index]
+                return (b'{\n' + member + b'"name": ' + _quote(labels[index]) + b',\n' + member
+                        + (b'"type": "directory"' if directory else b'"type": "file"')
+                        + b',\n' + member + b'"children": [\n')
+
+            out.append(open_node(0))
+            # large nodes still open: [index, next child to write]
+            stack = [[0, 1]]
+            pending = 0
+            while stack:
+                frame = stack[-1]
+                index, child = frame
+                end = ends[index]
+                if child >= end:
+                    stack.pop()
+                    depth = depths[index]
+                    out.append(b'\n' + b' ' * (4 + 4 * depth) + b']\n' + b' ' * (2 + 4 * depth) + b'}')
+                    continue
+                sep = b',\n' if child > index + 1 else b''
+                if ends[child] - child > chunk_nodes:
+                    frame[1] = ends[child]
+                    out.append(sep + b' ' * (2 + 4 * depths[child]) + open_node(child))
+                    stack.append([child, child + 1])
+                    continue
+                # as many following small siblings as fit in one block, encoded together
+                group_end = ends[child]
+                limit = child + chunk_nodes
+                while group_end < end and ends[group_end] <= limit:
+                    group_end = ends[group_end]
+                frame[1] = group_end
+                out.append(sep + _encode_subtrees(tree, labels, child, group_end))
+                pending += group_end - child
+                if pending >= chunk_nodes:
+                    yield b''.join(out)
+                    out.clear()
+                    pending = 0
+
+        out.append(b',\n  "flat": [')
+        first = True
+        paths: List[str] = []
+        path_stack: List[str] = []
+        next_depths = chain(islice(depths, 1, None), (0,))
+        for name, depth, directory, next_depth in zip(names, depths, is_dir, next_depths):
+            parent_path = path_stack[depth - 1] if depth else ""
+            current_path = parent_path + "/" + name if parent_path else name
+            if next_depth > depth:
+                del path_stack[depth:]
+                path_stack.append(current_path)
+            if not directory:
+                paths.append(current_path)
+                if len(paths) >= chunk_nodes:
+                    out.append((b'\n' if first else b',\n') + _array_items(paths, b'  '))
+                    first = False
+                    paths.clear()
+                    yield b''.join(out)
+                    out.clear()
+        if paths:
+            out.append((b'\n' if first else b',\n') + _array_items(paths, b'  '))
+            first = False
+        out.append(b']\n}' if first else b'\n  ]\n}')
+        yield b''.join(out)
+    except Exception as exc:
+        logger.exception("JSON serialization failed")
+        raise SerializationError(str(exc)) from exc
+
+
+def serialize_tree_to_file(node: Union[TreeNode, FlatTree], fp: IO[bytes], keep_extensions: bool = True) -> None:
+    """Write the iter_json_bytes document to a binary file object, one block at a time."""
+    write = fp.write
+    for block in iter_json_bytes(node, keep_extensions=keep_extensions):
+        write(block)
+
+
 # -------------------------
 # Deserialization helpers
 # -------------------------
 
-def dict_tree_to_treenode(d: Dict[str, Any]) -> TreeNode:
+def _build_tree(d: Dict[str, Any], make_node: Callable[[Dict[str, Any]], TreeNode]) -> TreeNode:
     """
-    Convert a nested tree dict (name/type/children) back to TreeNode.
-    Note: the resulting TreeNode.path will be constructed from the node names joined by '/' during recursion
-    only when calling the caller that needs full paths (if required).
+    Iteratively convert a nested dict (with 'children' lists) to TreeNodes using make_node for each dict.
+    Children are created and attached in order before being expanded, so arbitrarily deep input
+    works without hitting Python's recursion limit.
     """
+    root = make_node(d)
+    stack = deque([(d, root)])
+    while stack:
+        current, node = stack.pop()
+        for c in current.get("children") or []:
+            child_node = make_node(c)
+            node.add_child(child_node)
+            stack.append((c, child_node))
+    return root
+
+
+def _tree_dict_node(d: Dict[str, Any]) -> TreeNode:
     name = d.get("name", "")
     type_ = d.get("type", "file")
-    is_dir = (type_ == "directory")
-    node = TreeNode(name=name, path=name, is_dir=is_dir)
-    children = d.get("children") or []
-    for c in children:
-        child_node = dict_tree_to_treenode(c)
-        node.add_child(child_node)
-    return node
+    return TreeNode(name=name, path=name, is_dir=(type_ == "directory"))
+
+
+def _legacy_dict_node(d: Dict[str, Any]) -> TreeNode:
+    name = d.get("name", "")
+    path = d.get("path", name)
+    type_ = d.get("type") or ("directory" if d.get("children") else "file")
+    return TreeNode(name=name, path=path, is_dir=(type_ == "directory"))
+
+
+def dict_tree_to_treenode(d: Dict[str, Any]) -> TreeNode:
+    """
+    Convert a nested tree dict (name/type/children) back to TreeNode.
+    Note: the resulting TreeNode.path is only the node name; callers that need full paths
+    join the names along the way themselves (if required).
+    """
+    return _build_tree(d, _tree_dict_node)
 
 
 def flat_list_to_tree(flat_list: List[str]) -> TreeNode:
@@ -123,34 +354,38 @@ def flat_list_to_tree(flat_list: List[str]) -> TreeNode:
     if not flat_list:
         return TreeNode(name="empty", path="", is_dir=True)
 
-    # Build a nested dict tree structure first
+    # Build the tree, keeping a name -> child index per node (keyed by id(node)) so that
+    # locating an existing child is a dict lookup instead of a scan over its siblings
     root = None
+    children_index: Dict[int, Dict[str, TreeNode]] = {}
     for p in flat_list:
         parts = [part for part in p.strip("/").split("/") if part]
         if not parts:
             continue
         if root is None:
             root = TreeNode(name=parts[0], path=parts[0], is_dir=True)
+            children_index[id(root)] = {}
         # ensure the flat list root matches
         if parts[0] != root.name:
             # If different roots exist, create a virtual root
             if root.name != "__virtual_root__":
                 virtual = TreeNode(name="__virtual_root__", path="", is_dir=True)
                 virtual.add_child(root)
+                children_index[id(virtual)] = {root.name: root}
                 root = virtual
         # traverse/insert
         node_cursor = root
+        last = len(parts) - 1
         for i, part in enumerate(parts[1:], start=1):
-            # find child with this name
-            found = None
-            for c in node_cursor.children:
-                if c.name == part:
-                    found = c
-                    break
-            is_last = (i == len(parts) - 1)
+            siblings = children_index[id(node_cursor)]
+            found = siblings.get(part)
             if found is None:
-                new_node = TreeNode(name=part, path=os.path.join(node_cursor.path, part), is_dir=(not is_last))
+                # virtual '/'-joined paths: plain concatenation instead of os.path.join
+                parent_path = node_cursor.path
+                new_node = TreeNode(name=part, path=f"{parent_path}/{part}" if parent_path else part, is_dir=(i != last))
                 node_cursor.add_child(new_node)
+                siblings[part] = new_node
+                children_index[id(new_node)] = {}
                 node_cursor = new_node
             else:
                 node_cursor = found
@@ -185,18 +420,7 @@ def deserialize_json_to_tree(data: Any) -> TreeNode:
         # If top-level is a dict that looks like legacy NodeSchema (has 'path' or 'type')
         if isinstance(data, dict):
             # Legacy handling: attempt to use the old keys (path/children)
-            def legacy_dict_to_tree(d: Dict[str, Any]) -> TreeNode:
-                name = d.get("name", "")
-                path = d.get("path", name)
-                type_ = d.get("type") or ("directory" if d.get("children") else "file")
-                is_dir = type_ == "directory"
-                node = TreeNode(name=name, path=path, is_dir=is_dir)
-                children = d.get("children") or []
-                for c in children:
-                    child_node = legacy_dict_to_tree(c)
-                    node.add_child(child_node)
-                return node
-            return legacy_dict_to_tree(data)
+            return _build_tree(data, _legacy_dict_node)
 
         # unknown shape -> return empty
         return TreeNode(name="empty", path="", is_dir=True)
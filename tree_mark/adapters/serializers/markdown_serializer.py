@@ -1,39 +1,100 @@
 # === FILE: tree_mark/adapters/serializers/markdown_serializer.py ===
-import os
 import re
-from typing import List
+import sys
+from functools import lru_cache
+from typing import Iterator, List, Tuple, Union
+from tree_mark.core.entities.flat_tree import FlatTree
 from tree_mark.core.entities.tree_node import TreeNode
 from tree_mark.exceptions import SerializationError
 from loguru import logger
 
+# one list item of the nested Markdown format: indentation, name, optional trailing '/' for directories
+_LINE_RE = re.compile(r'^( *)- (.+?)(/?)\s*$')
 
-def node_to_markdown_lines(node: TreeNode, depth: int = 0, keep_extensions: bool = True) -> List[str]:
+# lines per block yielded by iter_markdown_bytes (~64 KiB for typical names)
+_CHUNK_LINES = 2048
+
+# documents remembered by parse_markdown_to_tree
+_PARSE_CACHE_SIZE = 16
+
+
+def iter_markdown_bytes(node: Union[TreeNode, FlatTree], keep_extensions: bool = True, chunk_lines: int = _CHUNK_LINES) -> Iterator[bytes]:
+    """
+    Serialize tree to UTF-8 encoded Markdown, yielding it in blocks of chunk_lines lines.
+    The tree is consumed as a FlatTree (pre-order arrays, i.e. already in output order), so this is one
+    loop over the arrays; each block is joined and encoded at C level. Feeding the blocks straight to a
+    file keeps memory bounded by the block size instead of the size of the whole document.
+    """
     try:
+        tree = node if isinstance(node, FlatTree) else FlatTree.from_treenode(node)
         lines: List[str] = []
-        indent = '  ' * depth
-        prefix = f"{indent}- "
-        # Optionally strip extension for file names in Markdown
-        display_name = node.name
-        if not keep_extensions and not node.is_dir:
-            display_name = os.path.splitext(node.name)[0]
-        entry = f"{prefix}{display_name}/" if node.is_dir else f"{prefix}{display_name}"
-        lines.append(entry)
-        if node.children:
-            for child in node.children:
-                lines.extend(node_to_markdown_lines(child, depth + 1, keep_extensions))
-        return lines
+        add_line = lines.append
+        # lines are newline separated, not terminated: every block after the first starts with one
+        separator = b''
+        # "<indent>- " prefixes indexed by depth, and the name suffix indexed by is_dir: everything that
+        # varies per node is resolved up front, so the loop body is the same for every node
+        prefixes = ['  ' * depth + '- ' for depth in range(max(tree.depths, default=0) + 1)]
+        suffixes = ('', '/')
+        for name, depth, directory in zip(tree.display_names(keep_extensions), tree.depths, tree.is_dir):
+            add_line(prefixes[depth] + name + suffixes[directory])
+            if len(lines) >= chunk_lines:
+                yield separator + '\n'.join(lines).encode('utf-8')
+                separator = b'\n'
+                lines.clear()
+        if lines:
+            yield separator + '\n'.join(lines).encode('utf-8')
     except Exception as exc:
         logger.exception("Markdown conversion error")
         raise SerializationError(str(exc)) from exc
 
-async def serialize_to_markdown(node: TreeNode, keep_extensions: bool = True) -> str:
+async def serialize_to_markdown_bytes(node: Union[TreeNode, FlatTree], keep_extensions: bool = True) -> bytes:
+    """Serialize tree to UTF-8 encoded Markdown in a single pass (see iter_markdown_bytes)."""
+    return b''.join(iter_markdown_bytes(node, keep_extensions=keep_extensions, chunk_lines=sys.maxsize))
+
+async def serialize_to_markdown(node: Union[TreeNode, FlatTree], keep_extensions: bool = True) -> str:
     """Serialize tree to Markdown. Set keep_extensions=False to remove extensions from displayed file names."""
-    lines = node_to_markdown_lines(node, keep_extensions=keep_extensions)
-    return "\n".join(lines)
+    return (await serialize_to_markdown_bytes(node, keep_extensions=keep_extensions)).decode('utf-8')
 
 # ------------------------------------------------------------------
 # Markdown -> TreeNode parser
 
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_markdown_entries(md_text: str) -> Tuple[Tuple[str, int, bool], ...]:
+    """The (name, depth, is_dir) of every list item in md_text, in document order (the root at depth 0).
+
+    Memoized on the text; being immutable, the result can be shared by every caller.
+    """
+    lines = [ln for ln in md_text.splitlines() if ln.strip()]
+    if not lines:
+        return ()
+
+    root_line = lines[0]
+    # extract the root name
+    m = _LINE_RE.match(root_line)
+    if m:
+        _, root_name, slash = m.groups()
+        root_is_dir = bool(slash)
+    else:
+        root_name = root_line.strip().rstrip('/')
+        root_is_dir = root_line.strip().endswith('/')
+    entries = [(root_name, 0, root_is_dir)]
+    # indentation levels of the open ancestors; the tree depth of a line is how many of them remain
+    indents = [0]
+
+    for line in lines[1:]:
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        leading, name_part, slash = m.groups()
+        indent = len(leading) >> 1  # we used '  ' per level
+        # find parent
+        while indents and indents[-1] >= indent:
+            indents.pop()
+        entries.append((name_part, len(indents), bool(slash)))
+        indents.append(indent)
+
+    return tuple(entries)
+
 def parse_markdown_to_tree(md_text: str) -> TreeNode:
     """
     Parse the simple nested markdown format we produce:
@@ -41,32 +102,21 @@ def parse_markdown_to_tree(md_text: str) -> TreeNode:
         - child/
           - file.txt
     Assumes indentation is 2 spaces per level as produced elsewhere.
+    Parsing is memoized on the text (see _parse_markdown_entries); every call still builds a fresh tree.
     """
-    lines = [ln for ln in md_text.splitlines() if ln.strip()]
-    if not lines:
+    entries = _parse_markdown_entries(md_text)
+    if not entries:
         return TreeNode(name="empty", path="", is_dir=True)
 
-    # We will use a stack of (depth, node)
-    root_line = lines[0]
-    # extract the root name
-    m = re.match(r'\s*- (.+)', root_line)
-    root_name = m.group(1).rstrip('/') if m else root_line.strip().rstrip('/')
-    root = TreeNode(name=root_name, path=root_name, is_dir=root_line.strip().endswith('/'))
-    stack = [(0, root)]
-
-    for line in lines[1:]:
-        # count leading spaces
-        leading = len(line) - len(line.lstrip(' '))
-        depth = leading // 2  # we used '  ' per level
-        # extract name (strip '- ' and trailing '/')
-        name_part = line.strip().lstrip('- ').rstrip('/')
-        is_dir = line.strip().endswith('/')
-        node = TreeNode(name=name_part, path=name_part, is_dir=is_dir)
-        # find parent
-        while stack and stack[-1][0] >= depth:
-            stack.pop()
-        parent_depth, parent_node = stack[-1]
+    root_name, _, root_is_dir = entries[0]
+    root = TreeNode(name=root_name, path=root_name, is_dir=root_is_dir)
+    # open ancestors, indexed by depth
+    stack = [root]
+    for name, depth, is_dir in entries[1:]:
+        del stack[depth:]
+        parent_node = stack[-1]
+        node = TreeNode(name=name, path=f"{parent_node.path}/{name}", is_dir=is_dir)
         parent_node.add_child(node)
-        stack.append((depth, node))
+        stack.append(node)
 
     return root
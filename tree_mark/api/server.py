@@ -1,4 +1,6 @@
 # === FILE: tree_mark/api/server.py ===
+from collections import OrderedDict
+from functools import lru_cache
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
@@ -6,7 +8,7 @@ from tree_mark.core.usecases.generate_structure import GenerateStructureUseCase
 from tree_mark.core.models.schemas import OutputFormat
 from loguru import logger
 
-from tree_mark.core.models.usecase_result import UseCaseResult
+from tree_mark.core.models.usecase_result import normalize_result
 
 app = FastAPI(title="TreeMark API")
 
@@ -17,15 +19,25 @@ class GenerateRequest(BaseModel):
     output: OutputFormat = OutputFormat.BOTH
     concurrency: int = 10
 
+# concurrency comes from the client: clamp it so a handful of instances covers every request
+_MAX_CONCURRENCY = 64
+# one scan cache for every instance, so the API holds at most _SCAN_CACHE_SIZE trees in memory
+_scan_cache: "OrderedDict" = OrderedDict()
+
+@lru_cache(maxsize=8)
+def _get_usecase(concurrency: int) -> GenerateStructureUseCase:
+    """One instance per (clamped) concurrency value, all sharing the module's scan cache."""
+    return GenerateStructureUseCase(max_concurrency=concurrency, scan_cache=_scan_cache)
+
 @app.post('/generate')
 async def api_generate(req: GenerateRequest):
     try:
-        usecase = GenerateStructureUseCase(max_concurrency=req.concurrency)
+        usecase = _get_usecase(max(1, min(req.concurrency, _MAX_CONCURRENCY)))
         # (results, elapsed) = await usecase.generate(req.path, req.include_extensions, req.exclude_extensions, req.output)
         # return {"results": results, "elapsed": elapsed}
         res = await usecase.generate(req.path, req.include_extensions, req.exclude_extensions, req.output, outputs_dir='outputs')
-        if isinstance(res, UseCaseResult):
-            return {"results": res.results, "elapsed": res.elapsed}
+        results, elapsed = normalize_result(res)
+        return {"results": results, "elapsed": elapsed}
     except Exception as exc:
         logger.exception("API generate failed")
         raise HTTPException(status_code=500, detail=str(exc))
\ No newline at end of file
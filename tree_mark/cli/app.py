@@ -14,35 +14,36 @@ import os
 import sys
 import asyncio
 import typer
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from loguru import logger
 
-from tree_mark.core.models.schemas import OutputFormat
-from tree_mark.core.usecases.generate_structure import GenerateStructureUseCase
-from tree_mark.core.models.usecase_result import UseCaseResult
+try:  # optional: faster event loop for the CLI (not available on Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from tree_mark.core.models.enums import OutputFormat
+from tree_mark.core.models.usecase_result import normalize_result
 from tree_mark.logging_config import configure_logging
 from tree_mark.cli.progress import console
 
-from tree_mark.utils.io_helpers import ensure_outputs_dir, sanitize_path_for_filename
-from tree_mark.adapters.serializers.json_serializer import (
-    deserialize_json_to_tree,
-    serialize_to_json,
-    node_to_tree_dict,
-    flatten_tree_to_paths,
-)
-from tree_mark.adapters.serializers.markdown_serializer import (
-    parse_markdown_to_tree,
-    serialize_to_markdown,
-)
-from tree_mark.adapters.repository.file_repository import write_text_file, write_json_file
-from tree_mark.scripts.create_from_json import recreate_from_json
-
 from tree_mark.cli.file_opener import list_output_files, open_file_in_browser
 
+# The use case, serializers, repository and recreate script (and pydantic behind them) are imported
+# inside the commands that use them, so `treemark --help` and prompt start-up don't pay for them.
+
 app = typer.Typer(help="TreeMark CLI — generate folder structure as JSON/Markdown and recreate from JSON")
 
 
+def _run_async(coro):
+    """asyncio.run(coro), on a uvloop event loop when uvloop is installed."""
+    if uvloop is None:
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+
 # -------------------------
 # Small interactive helpers
 # -------------------------
@@ -50,6 +51,8 @@ class BackSignal(Exception):
     """Raised when user types 'back' to go to previous menu."""
     pass
 
+_CONTROL_WORDS = frozenset(("exit", "back"))
+
 def check_exit_back(raw: Optional[str]) -> Optional[str]:
     """
     Check a raw input string: if 'exit' -> terminate application.
@@ -58,13 +61,14 @@ def check_exit_back(raw: Optional[str]) -> Optional[str]:
     """
     if raw is None:
         return raw
-    s = raw.strip()
-    if s.lower() == "exit":
+    # normalised once; ordinary answers leave after a single set lookup
+    s = raw.strip().lower()
+    if s not in _CONTROL_WORDS:
+        return raw
+    if s == "exit":
         console.print("[bold red]Exit command received. Terminating...[/bold red]")
         sys.exit(0)
-    if s.lower() == "back":
-        raise BackSignal()
-    return raw
+    raise BackSignal()
 
 def prompt_with_controls(prompt_text: str, default: Optional[str] = None) -> str:
     """
@@ -105,7 +109,7 @@ def generate(
     if interactive:
         # If interactive flag is passed to generate, hand off to the interactive flow
         console.print("Interactive flag detected — launching interactive mode...")
-        asyncio.run(_interactive_main(default_outputs_dir=outputs_dir))
+        _run_async(_interactive_main(default_outputs_dir=outputs_dir))
         return
 
     if include_extensions:
@@ -113,21 +117,15 @@ def generate(
     if exclude_extensions:
         exclude_exts = [e.strip() for e in exclude_extensions.split(',') if e.strip()]
 
+    from tree_mark.core.usecases.generate_structure import GenerateStructureUseCase
+
     usecase = GenerateStructureUseCase(scanner_kind=scanner_kind, max_concurrency=concurrency)
 
     async def _run():
         with console.status(f"Scanning {folder}..."):
             res = await usecase.generate(folder, include_exts, exclude_exts, output, outputs_dir, keep_extensions)
 
-        # Normalize return shapes
-        if isinstance(res, UseCaseResult):
-            results, elapsed = res.results, res.elapsed
-        elif isinstance(res, tuple) and len(res) == 2:
-            results, elapsed = res
-        elif isinstance(res, dict):
-            results, elapsed = res, 0.0
-        else:
-            results, elapsed = {}, 0.0
+        results, elapsed = normalize_result(res)
 
         console.print("\n[green]Done.[/green]")
         if results:
@@ -137,7 +135,7 @@ def generate(
             console.print("  - (no output files produced)")
         console.print(f"  - Time taken: {elapsed:.3f}s\n")
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 # -------------------------
@@ -150,7 +148,7 @@ def interactive(default_outputs_dir: str = typer.Option('outputs', help="Default
     """
     configure_logging()
     try:
-        asyncio.run(_interactive_main(default_outputs_dir=default_outputs_dir))
+        _run_async(_interactive_main(default_outputs_dir=default_outputs_dir))
     except KeyboardInterrupt:
         console.print("\n[bold red]Interactive session terminated by user.[/bold red]")
 
@@ -163,10 +161,20 @@ async def _interactive_main(default_outputs_dir: str = 'outputs'):
       - 'exit' anywhere to quit
       - 'back' to step back in a nested flow
     """
+    from tree_mark.core.usecases.generate_structure import GenerateStructureUseCase
+    from tree_mark.utils.io_helpers import ensure_outputs_dir, sanitize_path_for_filename
+    from tree_mark.adapters.serializers.json_serializer import deserialize_json_to_tree, serialize_to_json
+    from tree_mark.adapters.serializers.markdown_serializer import iter_markdown_bytes, parse_markdown_to_tree
+    from tree_mark.adapters.repository.file_repository import read_json_file, read_json_flat_sample, read_text_file, write_chunks_file, write_json_file
+    from tree_mark.scripts.create_from_json import recreate_from_json
+
     console.rule("[bold green]TreeMark — Interactive Mode[/]")
     console.print("Type the number of an option, or the option text (e.g. 1 or 'scan').")
     console.print("Type 'exit' anytime to quit, or 'back' to go to the previous step.\n")
 
+    # one use case per concurrency setting, kept for the session so repeated scans of a folder hit its scan cache
+    usecases: Dict[int, GenerateStructureUseCase] = {}
+
     # navigation stack not strictly necessary here; we use BackSignal to return to previous prompt
     while True:
         main_menu = (
@@ -237,7 +245,9 @@ async def _interactive_main(default_outputs_dir: str = 'outputs'):
                         concurrency = 10
 
                 # run the usecase
-                usecase = GenerateStructureUseCase(scanner_kind='auto', max_concurrency=concurrency)
+                usecase = usecases.get(concurrency)
+                if usecase is None:
+                    usecase = usecases[concurrency] = GenerateStructureUseCase(scanner_kind='auto', max_concurrency=concurrency)
                 console.print(f"\n[blue]Scanning:[/blue] {folder}")
                 console.print(f"[blue]Output format:[/blue] {out_fmt}   [blue]Keep extensions:[/blue] {'Yes' if keep_ext else 'No'}   [blue]Outputs dir:[/blue] {outputs_dir}\n")
 
@@ -245,14 +255,7 @@ async def _interactive_main(default_outputs_dir: str = 'outputs'):
                 with console.status(f"Scanning {folder}..."):
                     res = await usecase.generate(folder, None, None, out_fmt, outputs_dir, keep_ext)
 
-                if isinstance(res, UseCaseResult):
-                    results, elapsed = res.results, res.elapsed
-                elif isinstance(res, tuple) and len(res) == 2:
-                    results, elapsed = res
-                elif isinstance(res, dict):
-                    results, elapsed = res, 0.0
-                else:
-                    results, elapsed = {}, 0.0
+                results, elapsed = normalize_result(res)
 
                 console.print("\n[green]Scan complete.[/green]")
                 if results:
@@ -261,15 +264,12 @@ async def _interactive_main(default_outputs_dir: str = 'outputs'):
                         console.print(f"  - JSON: {results['json']}")
                         # Optionally show the 'flat' preview from the generated JSON (if present)
                         try:
-                            # load generated json to show top 3 flat entries for convenience
-                            import json as _json
-                            with open(results['json'], 'r', encoding='utf8') as jf:
-                                jdata = _json.load(jf)
-                                flat = jdata.get('flat') if isinstance(jdata, dict) else None
-                                if flat and isinstance(flat, list):
-                                    console.print("  - sample files:")
-                                    for p in flat[:3]:
-                                        console.print(f"      * {p}")
+                            # peek at the first 3 flat entries without loading the whole document
+                            sample = await read_json_flat_sample(results['json'], 3)
+                            if sample:
+                                console.print("  - sample files:")
+                                for p in sample:
+                                    console.print(f"      * {p}")
                         except Exception:
                             pass
                     else:
@@ -301,7 +301,7 @@ async def _interactive_main(default_outputs_dir: str = 'outputs'):
                 console.print("[green]Done.[/green]\n")
             elif suffix in (".md", ".markdown", ""):
                 console.print("[blue]Converting Markdown -> JSON then recreating...[/blue]")
-                md_text = open(src_file, 'r', encoding='utf8').read()
+                md_text = await read_text_file(src_file)
                 tree = parse_markdown_to_tree(md_text)
                 json_obj = await serialize_to_json(tree)
                 outputs_dir = ensure_outputs_dir(default_outputs_dir)
@@ -321,17 +321,15 @@ async def _interactive_main(default_outputs_dir: str = 'outputs'):
                 continue
 
             try:
-                with open(src_json, 'r', encoding='utf8') as f:
-                    import json as _json
-                    jdata = _json.load(f)
+                jdata = await read_json_file(src_json)
                 # handle combined format or legacy
                 tree_root = deserialize_json_to_tree(jdata)
                 ke = prompt_with_controls("Keep file extensions in Markdown? (Y/n) — default: Y", default="Y")
                 keep_ext = False if ke.lower().startswith("n") else True
-                md_text = await serialize_to_markdown(tree_root, keep_extensions=keep_ext)
                 outputs_dir = ensure_outputs_dir(outputs_dir)
                 fname = os.path.join(outputs_dir, sanitize_path_for_filename(src_json) + ".md")
-                await write_text_file(fname, md_text)
+                # encoded blocks straight to disk, as in generate: no whole-document str to decode and re-encode
+                await write_chunks_file(fname, iter_markdown_bytes(tree_root, keep_extensions=keep_ext))
                 console.print(f"[green]Wrote Markdown to {fname}[/green]\n")
             except BackSignal:
                 continue
@@ -347,7 +345,7 @@ async def _interactive_main(default_outputs_dir: str = 'outputs'):
                 continue
 
             try:
-                md_text = open(src_md, 'r', encoding='utf8').read()
+                md_text = await read_text_file(src_md)
                 tree = parse_markdown_to_tree(md_text)
                 ke = prompt_with_controls("Keep file extensions in JSON 'name' fields? (Y/n) — default: Y", default="Y")
                 keep_ext = False if ke.lower().startswith("n") else True
@@ -0,0 +1,128 @@
+import os
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+from tree_mark.core.entities.tree_node import TreeNode
+
+
+@dataclass
+class FlatTree:
+    """Structure-of-arrays view of a TreeNode tree, used on the serialization hot path.
+
+    Nodes are stored in depth-first pre-order, which is exactly the order both serializers emit them in,
+    so a serializer is a single loop over indices instead of a walk over linked node objects.
+    - names / depths: name and depth (root = 0) of each node
+    - is_dir: 1 for directories, 0 for files
+    - sizes: file size, or -1 when unknown; empty when no node has a known size (scans without
+      collect_sizes), so a size-less tree carries no per-node size storage at all
+    - ends: index one past the node's last descendant; the children of i are i + 1, ends[i + 1], ...
+    - root_path: path of the root node; the other paths are derived from it and the names
+    """
+    names: List[str] = field(default_factory=list)
+    depths: array = field(default_factory=lambda: array('i'))
+    is_dir: bytearray = field(default_factory=bytearray)
+    sizes: array = field(default_factory=lambda: array('q'))
+    root_path: str = ""
+    _ends: Optional[array] = field(default=None, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_treenode(cls, root: TreeNode) -> "FlatTree":
+        flat = cls(root_path=root.path)
+        # names repeat across directories (__init__.py, src, README.md, ...): interned, every FlatTree
+        # (including those kept in the scan cache) shares one string per distinct name
+        intern = sys.intern
+        add_name = flat.names.append
+        add_depth = flat.depths.append
+        add_is_dir = flat.is_dir.append
+        sizes = flat.sizes
+        stack = [(root, 0)]
+        pop = stack.pop
+        push_all = stack.extend
+        while stack:
+            node, depth = pop()
+            add_name(intern(node.name))
+            add_depth(depth)
+            size = node.size
+            if size is not None:
+                # allocated on the first known size, back-filling the nodes before it as unknown
+                missing = len(flat.names) - 1 - len(sizes)
+                if missing:
+                    sizes.extend(array('q', [-1]) * missing)
+                sizes.append(size)
+            add_is_dir(1 if node.is_dir else 0)
+            if node.children:
+                depth += 1
+                push_all([(child, depth) for child in reversed(node.children)])
+        if sizes and len(sizes) < len(flat.names):
+            sizes.extend(array('q', [-1]) * (len(flat.names) - len(sizes)))
+        return flat
+
+    def to_treenode(self) -> TreeNode:
+        """Rebuild the linked TreeNode tree, for callers that still expect node objects."""
+        if not self.names:
+            raise ValueError("empty FlatTree")
+        join = os.path.join
+        size_of = self.size
+        parents: List[TreeNode] = []
+        root: Optional[TreeNode] = None
+        for i, (name, depth, directory) in enumerate(zip(self.names, self.depths, self.is_dir)):
+            if depth:
+                parent = parents[depth - 1]
+                node = TreeNode(name, join(parent.path, name), bool(directory), size_of(i))
+                parent.children.append(node)
+            else:
+                node = root = TreeNode(name, self.root_path or name, bool(directory), size_of(i))
+            del parents[depth:]
+            parents.append(node)
+        return root
+
+    @property
+    def ends(self) -> array:
+        """Index one past each node's last descendant (computed on first use; serializers don't need it)."""
+        if self._ends is None:
+            # a subtree ends where the next node at the same or a shallower depth starts
+            depths = self.depths
+            n = len(depths)
+            ends = array('i', [n]) * n
+            open_nodes: List[int] = []
+            for i in range(n):
+                depth = depths[i]
+                while open_nodes and depths[open_nodes[-1]] >= depth:
+                    ends[open_nodes.pop()] = i
+                open_nodes.append(i)
+            self._ends = ends
+        return self._ends
+
+    def children(self, index: int) -> Iterator[int]:
+        """Yield the indices of the direct children of the node at index."""
+        ends = self.ends
+        child = index + 1
+        end = ends[index]
+        while child < end:
+            yield child
+            child = ends[child]
+
+    def display_names(self, keep_extensions: bool = True) -> List[str]:
+        """Node names as the serializers print them: with keep_extensions=False file names lose their
+        extension (os.path.splitext), directory names are kept.
+
+        Resolved here once per tree, so the serializer loops carry no per-node keep_extensions branch.
+        """
+        if keep_extensions:
+            return self.names
+        splitext = os.path.splitext
+        # file names repeat a lot across directories: split each distinct one once
+        stems = {name: splitext(name)[0] for name in {n for n, d in zip(self.names, self.is_dir) if not d}}
+        return [name if directory else stems[name] for name, directory in zip(self.names, self.is_dir)]
+
+    def size(self, index: int) -> Optional[int]:
+        sizes = self.sizes
+        if not sizes:
+            return None
+        size = sizes[index]
+        return None if size < 0 else size
@@ -0,0 +1,14 @@
+# === FILE: tree_mark/core/models/enums.py ===
+from enum import Enum
+
+
+class NodeType(str, Enum):
+    DIRECTORY = "directory"
+    FILE = "file"
+    ARCHIVE = "archive"
+
+
+class OutputFormat(str, Enum):
+    JSON = "json"
+    MARKDOWN = "markdown"
+    BOTH = "both"
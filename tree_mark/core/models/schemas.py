@@ -1,20 +1,10 @@
 # === FILE: tree_mark/core/models/schemas.py ===
 from __future__ import annotations
-from enum import Enum
 from typing import List, Optional
 from pydantic import BaseModel
 
-
-class NodeType(str, Enum):
-    DIRECTORY = "directory"
-    FILE = "file"
-    ARCHIVE = "archive"
-
-
-class OutputFormat(str, Enum):
-    JSON = "json"
-    MARKDOWN = "markdown"
-    BOTH = "both"
+# the enums live in a pydantic-free module so the CLI can import them cheaply; re-exported here
+from tree_mark.core.models.enums import NodeType, OutputFormat
 
 
 class NodeSchema(BaseModel):
@@ -1,6 +1,6 @@
 # tree_mark/core/models/usecase_result.py
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 @dataclass
 class UseCaseResult:
@@ -11,3 +11,17 @@ class UseCaseResult:
     """
     results: Dict[str, Any]
     elapsed: float
+
+
+def normalize_result(res: Any) -> Tuple[Dict[str, Any], float]:
+    """
+    (results, elapsed) from whatever a use case returned: a UseCaseResult, a legacy (results, elapsed)
+    tuple or a bare results dict. Anything else yields no results.
+    """
+    if isinstance(res, UseCaseResult):
+        return res.results, res.elapsed
+    if isinstance(res, tuple) and len(res) == 2:
+        return res
+    if isinstance(res, dict):
+        return res, 0.0
+    return {}, 0.0
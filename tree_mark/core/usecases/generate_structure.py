@@ -1,24 +1,96 @@
 # === FILE: tree_mark/core/usecases/generate_structure.py ===
-from typing import Optional, List
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, List, Tuple
 from tree_mark.factory.scanner_factory import ScannerFactory
 from tree_mark.core.models.schemas import OutputFormat
-from tree_mark.adapters.serializers.json_serializer import serialize_to_json
-from tree_mark.adapters.serializers.markdown_serializer import serialize_to_markdown
-from tree_mark.adapters.repository.file_repository import write_json_file, write_text_file
+from tree_mark.core.entities.flat_tree import FlatTree
+from tree_mark.adapters.serializers.json_serializer import iter_json_bytes
+from tree_mark.adapters.serializers.markdown_serializer import iter_markdown_bytes
+from tree_mark.adapters.repository.file_repository import write_chunks_file
 from tree_mark.core.models.usecase_result import UseCaseResult
 from loguru import logger
 
 from tree_mark.utils.timeit import timeit_async
 
+# (real path, sorted include, sorted exclude)
+_ScanKey = Tuple[str, Tuple[str, ...], Tuple[str, ...]]
+_SCAN_CACHE_SIZE = 8
+# directory mtimes this close to the start of a scan may hide a change made while it ran
+# (mtimes can lag the wall clock by a tick, and some filesystems only keep 1-2 s)
+_RACY_MTIME_NS = 2_000_000_000
+
+
+def _dir_mtimes(tree: FlatTree) -> List[int]:
+    """st_mtime_ns of the root and of every directory below it (-1 if it can no longer be stat'ed).
+
+    Adding, removing or renaming an entry anywhere in the tree changes the mtime of its parent directory,
+    so an unchanged list means a fresh scan would produce the same tree. Only directories are stat'ed.
+    """
+    join = os.path.join
+    stat = os.stat
+    mtimes: List[int] = []
+    path_stack: List[str] = []
+    for name, depth, directory in zip(tree.names, tree.depths, tree.is_dir):
+        if depth and not directory:
+            continue
+        current_path = join(path_stack[depth - 1], name) if depth else tree.root_path
+        del path_stack[depth:]
+        path_stack.append(current_path)
+        try:
+            mtimes.append(stat(current_path).st_mtime_ns)
+        except OSError:
+            mtimes.append(-1)
+    return mtimes
+
 
 class GenerateStructureUseCase:
     """Use case orchestration for generating folder structures.
 
     It is intentionally thin: orchestration logic only. Business rules live in adapters and core models.
     """
-    def __init__(self, scanner_kind: str = 'auto', max_concurrency: int = 10):
+    def __init__(
+            self,
+            scanner_kind: str = 'auto',
+            max_concurrency: int = 10,
+            scan_cache_size: int = _SCAN_CACHE_SIZE,
+            scan_cache: Optional["OrderedDict[_ScanKey, Tuple[List[int], FlatTree]]"] = None,
+    ):
         self.scanner_kind = scanner_kind
         self.max_concurrency = max_concurrency
+        # recent scans (LRU, most recent last), reused while none of their directories has changed;
+        # pass the same scan_cache to several instances to share it (scans don't depend on concurrency)
+        self.scan_cache_size = scan_cache_size
+        self._scan_cache: "OrderedDict[_ScanKey, Tuple[List[int], FlatTree]]" = OrderedDict() if scan_cache is None else scan_cache
+
+    async def _cached_scan(self, key: _ScanKey) -> Optional[FlatTree]:
+        """The cached tree for key, if none of its directories has changed since it was scanned."""
+        cached = self._scan_cache.get(key)
+        if cached is None:
+            return None
+        mtimes, flat_tree = cached
+        fresh = await asyncio.to_thread(_dir_mtimes, flat_tree) == mtimes
+        # another request may have replaced or evicted the entry while the mtimes were read
+        if self._scan_cache.get(key) is cached:
+            if fresh:
+                self._scan_cache.move_to_end(key)
+            else:
+                del self._scan_cache[key]
+        return flat_tree if fresh else None
+
+    async def _remember_scan(self, key: _ScanKey, flat_tree: FlatTree, scan_started: int) -> None:
+        """Cache flat_tree unless one of its directories may have changed since scan_started (time.time_ns())."""
+        mtimes = await asyncio.to_thread(_dir_mtimes, flat_tree)
+        # an unchanged mtime from before the scan started means the scan saw that directory's final
+        # contents; a later (or missing) one means the tree may be stale already, so don't reuse it
+        if -1 in mtimes or max(mtimes) >= scan_started - _RACY_MTIME_NS:
+            logger.debug("Not caching scan of {}: a directory changed while it ran", key[0])
+            return
+        self._scan_cache[key] = (mtimes, flat_tree)
+        while len(self._scan_cache) > self.scan_cache_size:
+            self._scan_cache.popitem(last=False)
 
     # # async def generate(self, path: str, include_extensions: Optional[List[str]] = None, exclude_extensions: Optional[List[str]] = None, output: OutputFormat = OutputFormat.BOTH, out_prefix: str = 'treemark_out'):
     # @timeit_async
@@ -69,29 +141,44 @@ class GenerateStructureUseCase:
             keep_extensions: bool = True,
     ) -> UseCaseResult:
         logger.info("Starting generate for path={}", path)
-        scanner = ScannerFactory.get_scanner(path, kind=self.scanner_kind, max_concurrency=self.max_concurrency)
-        tree = await scanner.scan(path, include_extensions, exclude_extensions)
+        key = (os.path.realpath(path), tuple(sorted(include_extensions or ())), tuple(sorted(exclude_extensions or ())))
+        flat_tree = await self._cached_scan(key)
+        if flat_tree is not None:
+            logger.debug("Reusing cached scan for path={}", path)
+        else:
+            # neither the JSON nor the Markdown output contains sizes, so don't stat every file for them
+            scan_started = time.time_ns()
+            scanner = ScannerFactory.get_scanner(path, kind=self.scanner_kind, max_concurrency=self.max_concurrency, collect_sizes=False)
+            tree = await scanner.scan(path, include_extensions, exclude_extensions)
+            # flatten once; both serializers then run as plain loops over the same arrays
+            flat_tree = FlatTree.from_treenode(tree)
+            del tree
+            if self.scan_cache_size > 0:
+                await self._remember_scan(key, flat_tree, scan_started)
 
         # Prepare outputs directory and friendly filename
-        import os
         from tree_mark.utils.io_helpers import ensure_outputs_dir, sanitize_path_for_filename
 
         outputs_dir = ensure_outputs_dir(outputs_dir)
         safe_name = sanitize_path_for_filename(path)
 
-        results = {}
+        # (key, label, path, chunks); every output is streamed to disk block by block, never held in memory whole
+        writes = []
         if output in (OutputFormat.JSON, OutputFormat.BOTH):
-            json_obj = await serialize_to_json(tree, keep_extensions=keep_extensions)
             json_path = os.path.join(outputs_dir, f"{safe_name}.json")
-            await write_json_file(json_path, json_obj)
-            results['json'] = json_path
-            logger.info("Wrote JSON to {}", json_path)
+            # same bytes as write_json_file(serialize_to_json(...)), without building the dict or flat list
+            writes.append(('json', "JSON", json_path, iter_json_bytes(flat_tree, keep_extensions=keep_extensions)))
 
         if output in (OutputFormat.MARKDOWN, OutputFormat.BOTH):
-            md_text = await serialize_to_markdown(tree, keep_extensions=keep_extensions)
             md_path = os.path.join(outputs_dir, f"{safe_name}.md")
-            await write_text_file(md_path, md_text)
-            results['markdown'] = md_path
-            logger.info("Wrote Markdown to {}", md_path)
+            writes.append(('markdown', "Markdown", md_path, iter_markdown_bytes(flat_tree, keep_extensions=keep_extensions)))
+
+        # both writers run on their own worker threads; one's disk writes overlap the other's serialization
+        await asyncio.gather(*(write_chunks_file(out_path, chunks) for _, _, out_path, chunks in writes))
+
+        results = {}
+        for key, label, out_path, _ in writes:
+            results[key] = out_path
+            logger.info("Wrote {} to {}", label, out_path)
 
         return results
@@ -7,18 +7,19 @@ import os
 
 class ScannerFactory:
     @staticmethod
-    def get_scanner(path: str, kind: Literal['auto','local','zip'] = 'auto', max_concurrency: int = 10) -> ScannerInterface:
+    def get_scanner(path: str, kind: Literal['auto','local','zip'] = 'auto', max_concurrency: int = 10, collect_sizes: bool = True) -> ScannerInterface:
         """Return appropriate scanner for the path.
         - 'auto' will inspect the path and choose ZipArchiveScanner for .zip or LocalFileSystemScanner otherwise.
         - 'local' forces local filesystem scanner.
         - 'zip' forces zip scanner.
+        collect_sizes=False lets the local scanner skip the per-file stat used only to fill TreeNode.size.
         """
         if kind == 'auto':
             if os.path.isfile(path) and path.lower().endswith('.zip'):
                 return ZipArchiveScanner()
-            return LocalFileSystemScanner(max_concurrency=max_concurrency)
+            return LocalFileSystemScanner(max_concurrency=max_concurrency, collect_sizes=collect_sizes)
         if kind == 'local':
-            return LocalFileSystemScanner(max_concurrency=max_concurrency)
+            return LocalFileSystemScanner(max_concurrency=max_concurrency, collect_sizes=collect_sizes)
         if kind == 'zip':
             return ZipArchiveScanner()
         raise ValueError(f"Unknown scanner kind: {kind}")
\ No newline at end of file
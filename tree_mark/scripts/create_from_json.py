@@ -9,15 +9,36 @@ Recreate filesystem structure from a TreeMark JSON description.
 Note: This script creates empty files for files found in the structure.
 """
 
-import json
 import os
 import asyncio
-from typing import Any, Dict, List
+import posixpath
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, groupby
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Literal, Set, Tuple
 from tree_mark.exceptions import RepositoryError
-from tree_mark.adapters.repository.file_repository import write_text_file
+from tree_mark.adapters.repository.file_repository import load_json_flat_list, loads_json_bytes
 from tree_mark.adapters.serializers.json_serializer import deserialize_json_to_tree
 from loguru import logger
 
+# empty files in flight at once, and how many of them one worker-thread job creates
+_CREATE_CONCURRENCY = 256
+_CREATE_BATCH = 32
+
+# layouts of recreate inputs (see _detect_format)
+_Format = Literal["flat", "flat_wrapped", "tree", "legacy"]
+
+# flags of open(path, 'w'): create, or truncate an existing file
+_TOUCH_FLAGS = os.O_CREAT | os.O_WRONLY | os.O_TRUNC
+
+# directory batches at least this large are created by _MKDIR_WORKERS threads, one depth level at a time
+_MKDIR_PARALLEL_MIN = 64
+_MKDIR_WORKERS = 8
+
+# parsed JSON documents remembered by _load_json_cached (they can be large, so only a few)
+_LOAD_CACHE_SIZE = 8
+
 # OLD implementation (kept for reference):
 # async def _create_node(node: dict, dest: str, dry_run: bool = False):
 #     path = os.path.join(dest, node['name'])
@@ -38,126 +59,326 @@ from loguru import logger
 #             await write_text_file(path, "")
 #             logger.info("Created file: {}", path)
 
-async def _create_from_flat_list(flat: List[str], dest: str, dry_run: bool = False) -> None:
+def _parent_dirs(targets: List[str], dest: str, extra_dirs: Iterable[str] = ()) -> List[str]:
+    """Every directory between dest and the targets (and extra_dirs, inclusive), deduplicated and ordered parents first."""
+    dirs: Set[str] = set()
+    sep = os.sep
+    # targets come from _flat_targets, so their parent is everything before the last separator
+    # (and any run of separators there, as os.path.dirname would drop)
+    for parent in chain((target.rpartition(sep)[0].rstrip(sep) for target in targets), extra_dirs):
+        # stop at dest or at the first ancestor another target already contributed
+        while parent not in dirs and len(parent) > len(dest):
+            dirs.add(parent)
+            parent = os.path.dirname(parent)
+    return sorted(dirs, key=lambda d: d.count(os.sep))
+
+def _mkdir(dirpath: str) -> None:
+    try:
+        os.mkdir(dirpath)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        # a name with embedded separators ('a/b') skips a level
+        os.makedirs(dirpath, exist_ok=True)
+
+def _make_dirs(dirs: List[str], dest: str) -> None:
+    """
+    Create dest and then dirs (parents first, see _parent_dirs) with one mkdir each. Blocking: run it on a
+    worker thread. For larger batches the directories of one depth level, which don't depend on each
+    other, are created by _MKDIR_WORKERS threads in parallel (overlapping the round trips on network filesystems).
+    """
+    if dest:
+        # an empty dest means the current directory, which exists
+        os.makedirs(dest, exist_ok=True)
+    if len(dirs) < _MKDIR_PARALLEL_MIN:
+        for dirpath in dirs:
+            _mkdir(dirpath)
+        return
+    with ThreadPoolExecutor(max_workers=_MKDIR_WORKERS, thread_name_prefix="treemark-mkdir") as pool:
+        for _, level in groupby(dirs, key=lambda d: d.count(os.sep)):
+            # consuming the results waits for the level (and re-raises its first error)
+            for _ in pool.map(_mkdir, level):
+                pass
+
+def _ensure_dir(dirpath: str, created_dirs: Set[str]) -> None:
+    """os.makedirs(dirpath, exist_ok=True), skipped if this run already created dirpath or a directory below it."""
+    if dirpath in created_dirs:
+        return
+    os.makedirs(dirpath, exist_ok=True)
+    # makedirs created (or found) every ancestor too
+    while dirpath not in created_dirs:
+        created_dirs.add(dirpath)
+        parent = os.path.dirname(dirpath)
+        if parent == dirpath:
+            break
+        dirpath = parent
+
+def _touch(path: str) -> None:
+    """Create (or truncate) path as an empty file: just open + close, no buffered file object."""
+    os.close(os.open(path, _TOUCH_FLAGS, 0o644))
+
+def _touch_unless_file(path: str, skip_existing: bool) -> bool:
+    """_touch path unless skip_existing and it is already a file; whether it was touched. Blocking."""
+    if skip_existing and os.path.isfile(path):
+        return False
+    _touch(path)
+    return True
+
+def _touch_batch(targets: List[str]) -> List[Tuple[str, OSError]]:
+    """Create (or truncate) each target as an empty file; return the targets that failed, with their error."""
+    failed: List[Tuple[str, OSError]] = []
+    touch = _touch
+    for target in targets:
+        try:
+            touch(target)
+        except OSError as exc:
+            failed.append((target, exc))
+    return failed
+
+async def _touch_files(targets: List[str], verbose: bool = False) -> None:
+    """
+    Create the empty files concurrently. Their directories must exist.
+    Each worker-thread job creates _CREATE_BATCH files, so the thread hop is paid per batch rather than
+    per file; at most _CREATE_CONCURRENCY files are in flight.
+    Every file is attempted; failures are reported together once all creations have finished.
+    Each created file is logged only when verbose.
+    """
+    sem = asyncio.Semaphore(max(1, _CREATE_CONCURRENCY // _CREATE_BATCH))
+    log = logger.info
+
+    async def touch(batch: List[str]) -> List[Tuple[str, OSError]]:
+        async with sem:
+            failed = await asyncio.to_thread(_touch_batch, batch)
+        if verbose:
+            failed_paths = {target for target, _ in failed}
+            for target in batch:
+                if target not in failed_paths:
+                    log("Created file: {}", target)
+        return failed
+
+    batches = [targets[i:i + _CREATE_BATCH] for i in range(0, len(targets), _CREATE_BATCH)]
+    errors = [error for failed in await asyncio.gather(*map(touch, batches)) for error in failed]
+    if errors:
+        for target, exc in errors:
+            logger.error("Failed to create file {}: {}", target, exc)
+        raise RepositoryError(f"Failed to create {len(errors)} of {len(targets)} files: {errors[0][1]}") from errors[0][1]
+
+def _flat_targets(dest: str, flat: Iterable[str]) -> List[str]:
+    """
+    dest joined with each '/'-separated relative path, normalised ('a//b', './a' and 'a/' all name 'a...')
+    so the targets compare equal to the paths os.scandir reports. Equivalent to os.path.join for these
+    inputs (the entries are stripped of leading '/'), but a plain concatenation per entry.
+    """
+    sep = os.sep
+    normpath = posixpath.normpath
+    if not dest:
+        # relative to the current directory, as os.path.join("", rel) would give
+        return [normpath(rel.lstrip("/")).replace("/", sep) for rel in flat]
+    base = dest if dest.endswith((sep, os.altsep or sep)) else dest + sep
+    return [base + normpath(rel.lstrip("/")).replace("/", sep) for rel in flat]
+
+def _existing_entries(dirs: List[str], dest: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Which of dest and dirs (parents first) already exist, and the paths of the non-directory entries in them.
+    One scandir per existing directory; below a missing directory nothing is probed, so a fresh
+    destination costs a single failed listing per top-level directory. Other listing errors
+    (e.g. PermissionError) propagate.
+    """
+    existing_dirs: Set[str] = set()
+    entries: Set[str] = set()
+    missing: Set[str] = set()
+    for dirpath in chain((dest,), dirs):
+        if os.path.dirname(dirpath) in missing:
+            missing.add(dirpath)
+            continue
+        try:
+            if dirpath:
+                with os.scandir(dirpath) as it:
+                    entries.update(entry.path for entry in it if not entry.is_dir())
+            else:
+                # the current directory: scandir('.') would report './name', the targets are plain 'name'
+                with os.scandir(os.curdir) as it:
+                    entries.update(entry.name for entry in it if not entry.is_dir())
+        except (FileNotFoundError, NotADirectoryError):
+            missing.add(dirpath)
+            continue
+        existing_dirs.add(dirpath)
+    return existing_dirs, entries
+
+async def _create_from_flat_list(flat: List[str], dest: str, dry_run: bool = False, empty_dirs: Iterable[str] = (), verbose: bool = False, skip_existing: bool = True) -> None:
     """
     Create files & directories from a flat list of file paths.
     Each entry is relative (e.g., 'app/service/file.py'). We join with dest to create full paths.
+    empty_dirs are relative directories to create even though no file lies below them.
+    The directories are created up front, once each, rather than with a makedirs call per file.
+    skip_existing leaves files and directories that already exist alone (existing files are otherwise
+    truncated), found with one listing per directory instead of an open per file.
+    A dry run lists every entry without probing dest; a real run logs one summary line, plus every
+    created file when verbose.
     """
-    for rel in flat:
-        target = os.path.join(dest, *rel.strip("/").split("/"))
-        dirpath = os.path.dirname(target)
+    targets = _flat_targets(dest, flat)
+    dirs = _parent_dirs(targets, dest, _flat_targets(dest, empty_dirs))
+    skipped = 0
+    if skip_existing and not dry_run:
         try:
-            if dry_run:
-                logger.info("Would create directory: {}", dirpath)
-                logger.info("Would create file: {}", target)
-            else:
-                os.makedirs(dirpath, exist_ok=True)
-                # create empty file
-                await write_text_file(target, "")
-                logger.info("Created file: {}", target)
-        except Exception as exc:
-            logger.exception("Failed to create file for path: {}", target)
+            existing_dirs, existing_files = await asyncio.to_thread(_existing_entries, dirs, dest)
+        except OSError as exc:
+            logger.exception("Failed to list existing entries under: {}", dest)
             raise RepositoryError(str(exc)) from exc
+        if existing_dirs:
+            dirs = [dirpath for dirpath in dirs if dirpath not in existing_dirs]
+        if existing_files:
+            skipped = len(targets)
+            targets = [target for target in targets if target not in existing_files]
+            skipped -= len(targets)
+    if dry_run:
+        for dirpath in dirs:
+            logger.info("Would create directory: {}", dirpath)
+        for target in targets:
+            logger.info("Would create file: {}", target)
+        return
 
-async def _create_from_tree(node: Dict[str, Any], dest: str, dry_run: bool = False) -> None:
+    try:
+        await asyncio.to_thread(_make_dirs, dirs, dest)
+    except Exception as exc:
+        logger.exception("Failed to create directories under: {}", dest)
+        raise RepositoryError(str(exc)) from exc
+    await _touch_files(targets, verbose)
+    logger.info("Created {} files and {} directories under {} ({} files already existed)", len(targets), len(dirs), dest, skipped)
+
+def _tree_to_flat(node: Dict[str, Any], prefix: str = "") -> Tuple[List[str], List[str]]:
     """
-    Create files & directories from the nested tree dict (name/type/children).
-    We treat the nested 'name' segments as relative path components.
+    The nested tree dict (name/type/children) as '/'-joined relative paths: the files, as in the "flat"
+    list, and the directories without children, which a flat list cannot express.
+    We treat the nested 'name' segments as relative path components. Breadth-first with an explicit
+    queue, so arbitrarily deep trees need neither recursion nor a coroutine per node.
     """
-    name = node.get("name", "")
-    node_type = node.get("type", "file")
-    current_path = os.path.join(dest, name) if name else dest
+    files: List[str] = []
+    empty_dirs: List[str] = []
+    queue = deque([(node, prefix)])
+    while queue:
+        current, parent_path = queue.popleft()
+        name = current.get("name", "")
+        current_path = (parent_path + "/" + name if parent_path else name) if name else parent_path
+        if current.get("type", "file") == "directory":
+            children = current.get("children")
+            if children:
+                queue.extend((child, current_path) for child in children)
+            else:
+                empty_dirs.append(current_path)
+        else:
+            files.append(current_path)
+    return files, empty_dirs
 
+async def _create_from_tree(node: Dict[str, Any], dest: str, dry_run: bool = False, verbose: bool = False, skip_existing: bool = True) -> None:
+    """
+    Create files & directories from the nested tree dict, by flattening it once and
+    recreating that (see _create_from_flat_list).
+    """
     try:
-        if node_type == "directory":
-            if dry_run:
-                logger.info("Would create directory: {}", current_path)
-            else:
-                os.makedirs(current_path, exist_ok=True)
-                logger.info("Created directory: {}", current_path)
+        flat, empty_dirs = _tree_to_flat(node)
+    except Exception as exc:
+        logger.exception("Invalid tree structure under: {}", dest)
+        raise RepositoryError(str(exc)) from exc
+    await _create_from_flat_list(flat, dest, dry_run, empty_dirs, verbose, skip_existing)
 
-            for child in node.get("children", []) or []:
-                await _create_from_tree(child, current_path, dry_run)
-        else:
-            # file
+
+@lru_cache(maxsize=_LOAD_CACHE_SIZE)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    The parsed JSON document at path (orjson when installed). mtime_ns and size only key the cache,
+    so an edited file is parsed again. The result is shared between calls: treat it as read-only.
+    For TreeMark outputs, whose "flat" list takes precedence anyway, only that list is decoded and
+    {"flat": [...]} is returned: the nested tree section is never parsed or held in memory.
+    """
+    flat = load_json_flat_list(path)
+    if flat is not None:
+        return {"flat": flat}
+    with open(path, 'rb') as f:
+        return loads_json_bytes(f.read())
+
+
+async def _legacy_create(d: Dict[str, Any], dest: str, dry_run: bool, created_dirs: Set[str], skip_existing: bool = True) -> None:
+    """
+    Recreate a legacy node dict, whose nodes carry 'path' fields (used relative to dest).
+    created_dirs holds the directories this run has made so far (see _ensure_dir).
+    skip_existing leaves existing files alone instead of truncating them.
+    """
+    p = d.get("path", None)
+    if p:
+        # make relative path (strip drive / absolute prefix)
+        rel = p
+        # If absolute, make relative by taking basename chain
+        rel = rel.strip("/\\")
+        target = os.path.join(dest, *rel.split(os.sep))
+        if d.get("type", "") == "directory":
             if dry_run:
-                logger.info("Would create file: {}", current_path)
+                logger.info("Would create directory: {}", target)
             else:
-                # Ensure parent directory exists
-                parent = os.path.dirname(current_path)
-                os.makedirs(parent, exist_ok=True)
-                await write_text_file(current_path, "")
-                logger.info("Created file: {}", current_path)
-    except Exception as exc:
-        logger.exception("Failed to create node: {}", current_path)
-        raise RepositoryError(str(exc)) from exc
+                _ensure_dir(target, created_dirs)
+                logger.info("Created directory: {}", target)
+            for child in d.get("children", []) or []:
+                await _legacy_create(child, dest, dry_run, created_dirs, skip_existing)
+        elif dry_run:
+            # like the flat handler, a dry run doesn't probe dest and lists every file
+            logger.info("Would create file: {}", target)
+        else:
+            # normally the directory node above has just created it
+            _ensure_dir(os.path.dirname(target), created_dirs)
+            try:
+                created = await asyncio.to_thread(_touch_unless_file, target, skip_existing)
+            except OSError as exc:
+                logger.exception("Failed to create file: {}", target)
+                raise RepositoryError(str(exc)) from exc
+            if created:
+                logger.info("Created file: {}", target)
+
 
+def _detect_format(data: Any) -> _Format:
+    """
+    Layout of a parsed recreate input, first match wins:
+      - 'flat': top-level JSON array of file paths
+      - 'flat_wrapped': object with a "flat" list (preferred over its "tree")
+      - 'tree': object with a nested "tree"
+      - 'legacy': any other object (nodes carrying 'path' fields)
+    """
+    if isinstance(data, list):
+        return "flat"
+    if isinstance(data, dict):
+        if "flat" in data:
+            return "flat_wrapped"
+        if "tree" in data:
+            return "tree"
+        return "legacy"
+    raise RepositoryError("Unsupported JSON format for recreation.")
 
-async def recreate_from_json(json_path: str, dest: str, dry_run: bool = False) -> None:
+
+# (data, dest, dry_run, verbose, skip_existing) -> creation coroutine, per format (see _detect_format);
+# the root of a tree is created inside dest
+_HANDLERS: Dict[_Format, Callable[[Any, str, bool, bool, bool], Awaitable[None]]] = {
+    "flat": lambda data, dest, dry_run, verbose, skip: _create_from_flat_list(data, dest, dry_run, (), verbose, skip),
+    "flat_wrapped": lambda data, dest, dry_run, verbose, skip: _create_from_flat_list(data["flat"] or [], dest, dry_run, (), verbose, skip),
+    "tree": lambda data, dest, dry_run, verbose, skip: _create_from_tree(data["tree"], dest, dry_run, verbose, skip),
+    "legacy": lambda data, dest, dry_run, verbose, skip: _legacy_create(data, dest, dry_run, set(), skip),
+}
+
+
+async def recreate_from_json(json_path: str, dest: str, dry_run: bool = False, verbose: bool = False, skip_existing: bool = True) -> None:
     """
     Public entrypoint: read json file and recreate structure under dest.
     Handles:
       - combined format { "tree": {...}, "flat": [...] }
       - legacy nested format with 'path' keys
       - flat list (top-level JSON array)
+    verbose logs every created file instead of a summary (dry runs always list every entry).
+    skip_existing leaves files that already exist under dest untouched; otherwise they are truncated.
     """
     try:
-        with open(json_path, 'r', encoding='utf8') as f:
-            data = json.load(f)
+        st = os.stat(json_path)
+        # parsed on a worker thread; re-runs against an unchanged file (dry run, then for real) reuse the result
+        data = await asyncio.to_thread(_load_json_cached, json_path, st.st_mtime_ns, st.st_size)
     except Exception as exc:
         logger.exception("Failed to read json: {}", json_path)
         raise RepositoryError(str(exc)) from exc
 
-    # If data is a dict and contains flat list -> use that
-    if isinstance(data, dict) and "flat" in data:
-        flat = data["flat"] or []
-        await _create_from_flat_list(flat, dest, dry_run)
-        return
-
-    # If top-level is a list -> treat as flat list
-    if isinstance(data, list):
-        await _create_from_flat_list(data, dest, dry_run)
-        return
-
-    # If dict with 'tree'
-    if isinstance(data, dict) and "tree" in data:
-        tree = data["tree"]
-        # Create root inside dest
-        await _create_from_tree(tree, dest, dry_run)
-        return
-
-    # Otherwise try to interpret legacy node dict with 'path' fields
-    # We'll build a helper to recurse using path fields
-    async def legacy_create(d: Dict[str, Any], _dest: str, _dry: bool):
-        # If node has 'path' - use it relative to _dest root
-        p = d.get("path", None)
-        if p:
-            # make relative path (strip drive / absolute prefix)
-            rel = p
-            # If absolute, make relative by taking basename chain
-            rel = rel.strip("/\\")
-            target = os.path.join(_dest, *rel.split(os.sep))
-            if d.get("type", "") == "directory":
-                if _dry:
-                    logger.info("Would create directory: {}", target)
-                else:
-                    os.makedirs(target, exist_ok=True)
-                    logger.info("Created directory: {}", target)
-                for child in d.get("children", []) or []:
-                    await legacy_create(child, _dest, _dry)
-            else:
-                if _dry:
-                    logger.info("Would create file: {}", target)
-                else:
-                    parent = os.path.dirname(target)
-                    os.makedirs(parent, exist_ok=True)
-                    await write_text_file(target, "")
-                    logger.info("Created file: {}", target)
-
-    # Fallback: if data is dict, assume legacy structure
-    if isinstance(data, dict):
-        await legacy_create(data, dest, dry_run)
-        return
-
-    # Unknown format
-    raise RepositoryError("Unsupported JSON format for recreation.")
+    await _HANDLERS[_detect_format(data)](data, dest, dry_run, verbose, skip_existing)
@@ -1,4 +1,6 @@
 # === FILE: tree_mark/utils/timeit.py ===
+import functools
+import os
 import time
 from typing import Callable, TypeVar, Any, Coroutine, ParamSpec
 from tree_mark.core.models.usecase_result import UseCaseResult
@@ -6,22 +8,37 @@ from tree_mark.core.models.usecase_result import UseCaseResult
 P = ParamSpec('P')
 R = TypeVar('R')
 
+# TREEMARK_TIMEIT=0 turns timing off: decorated use cases then report elapsed=0.0
+TIMEIT_ENABLED = os.environ.get("TREEMARK_TIMEIT", "1") != "0"
+
+def _as_result(result: Any, elapsed: float) -> UseCaseResult:
+    # If the inner function already returned UseCaseResult, just update elapsed and return it.
+    if isinstance(result, UseCaseResult):
+        result.elapsed = elapsed
+        return result
+    # Otherwise, wrap into UseCaseResult (expecting result is a dict-like results payload)
+    return UseCaseResult(results=result if (result is not None) else {}, elapsed=elapsed)
+
 def timeit_async(func: Callable[P, Coroutine[Any, Any, R]]) -> Callable[P, Coroutine[Any, Any, UseCaseResult]]:
     """
     Decorator for async functions: measure elapsed time and return a UseCaseResult.
     If the wrapped function already returns a UseCaseResult, we only update its elapsed time.
+    Whether to time is decided once, when the function is decorated (see TIMEIT_ENABLED).
     """
-    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> UseCaseResult:
-        start = time.monotonic()
-        result = await func(*args, **kwargs)
-        duration = time.monotonic() - start
+    if not TIMEIT_ENABLED:
+        @functools.wraps(func)
+        async def passthrough(*args: P.args, **kwargs: P.kwargs) -> UseCaseResult:
+            return _as_result(await func(*args, **kwargs), 0.0)
 
-        # If the inner function already returned UseCaseResult, just update elapsed and return it.
-        if isinstance(result, UseCaseResult):
-            result.elapsed = duration
-            return result
+        return passthrough
 
-        # Otherwise, wrap into UseCaseResult (expecting result is a dict-like results payload)
-        return UseCaseResult(results=result if (result is not None) else {}, elapsed=duration)
+    # integer nanoseconds from the highest resolution clock (monotonic() is ~16 ms coarse on Windows)
+    clock = time.perf_counter_ns
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> UseCaseResult:
+        start = clock()
+        result = await func(*args, **kwargs)
+        return _as_result(result, (clock() - start) / 1e9)
 
-    return wrapper
\ No newline at end of file
+    return wrapper